@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from regression import MODELS, empty_statistics, update_statistics, coefficients_from_statistics, default_scale, predict
+from metrics import goodness_of_fit
+from orthogonal import OrthogonalPolynomialSweep
+from quote_cache import QuoteCache, csv_provider, yfinance_provider
+
+RESYNC = 512
+SLIDING = tuple(m for m in MODELS if m != 'polynomial')
+
+def _backtest_chunk(x, y, starts, window, horizon, step, degree, scale):
+    forecasts = {m: np.empty(len(starts)) for m in MODELS}
+    stats = None
+    for i, start in enumerate(starts):
+        end = start + window
+        if stats is None or (start // step) % RESYNC == 0:
+            stats = update_statistics(empty_statistics(2, scale), x[start:end], y[start:end])
+        else:
+            update_statistics(stats, x[end - step:end], y[end - step:end])
+            update_statistics(stats, x[start - step:start], y[start - step:start], sign=-1)
+        coefs = coefficients_from_statistics(stats, SLIDING)
+        target = x[end - 1 + horizon]
+        for m in SLIDING:
+            forecasts[m][i] = predict(m, coefs[m], target)
+        sweep = OrthogonalPolynomialSweep(x[start:end], y[start:end], degree)
+        forecasts['polynomial'][i] = sweep.predict(target, degree)
+    return forecasts
+
+def walk_forward(y, window, horizon=1, step=1, degree=16, workers=None):
+    y = np.asarray(y, dtype=float)
+    x = np.arange(1, len(y) + 1, dtype=float)
+    starts = np.arange(0, len(y) - window - horizon + 1, step)
+    if len(starts) == 0:
+        raise ValueError("Недостаточно данных для окна и горизонта прогноза")
+    scale = default_scale(x)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [c for c in np.array_split(starts, workers) if len(c)]
+    if len(chunks) == 1:
+        parts = [_backtest_chunk(x, y, chunks[0], window, horizon, step, degree, scale)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+            futures = [pool.submit(_backtest_chunk, x, y, c, window, horizon, step, degree, scale) for c in chunks]
+            parts = [f.result() for f in futures]
+
+    last = y[starts + window - 1]
+    actual = y[starts + window - 1 + horizon]
+    report = {'index': starts + window + horizon, 'actual': actual, 'last': last}
+    forecasts = np.array([np.concatenate([p[m] for p in parts]) for m in MODELS])
+    scores = goodness_of_fit(forecasts, actual)
+    for i, m in enumerate(MODELS):
+        report[m] = {
+            'forecast': forecasts[i],
+            'error': forecasts[i] - actual,
+            'mse': float(scores['mse'][i]),
+            'r2': float(scores['r2'][i]),
+            'mae': float(scores['mae'][i]),
+            'hit_rate': float(np.mean(np.sign(forecasts[i] - last) == np.sign(actual - last))),
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="USD/JPY walk-forward backtest")
+    parser.add_argument("start_date", type=str, help="Начальная дата в формате YYYY-MM-DD")
+    parser.add_argument("end_date", type=str, help="Конечная дата в формате YYYY-MM-DD")
+    parser.add_argument("--ticker", type=str, default="JPY=X")
+    parser.add_argument("--window", type=int, default=250, help="Длина окна обучения (торговых дней)")
+    parser.add_argument("--horizon", type=int, default=5, help="Горизонт прогноза (торговых дней)")
+    parser.add_argument("--step", type=int, default=1, help="Сдвиг окна (торговых дней)")
+    parser.add_argument("--degree", type=int, default=16, help="Степень полиномиальной модели")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+    parser.add_argument("--cache-dir", type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "quotes_cache"),
+                        help="Каталог локального кэша котировок")
+    parser.add_argument("--offline", action="store_true", help="Работать только с данными из кэша")
+    parser.add_argument("--fixture", type=str, default=None, help="CSV-файл (Date,Close) вместо загрузки из yfinance")
+
+    args = parser.parse_args()
+
+    provider = csv_provider(args.fixture) if args.fixture else yfinance_provider
+    cache = QuoteCache(args.cache_dir, provider, offline=args.offline)
+    dates, close = cache.get(args.ticker, args.start_date, args.end_date)
+    if len(dates) < args.window + args.horizon:
+        print("Недостаточно данных для бэктеста")
+        sys.exit()
+
+    report = walk_forward(close, args.window, args.horizon, args.step, args.degree, args.workers)
+
+    print(f"{args.ticker}: окно {args.window}, горизонт {args.horizon}, окон {len(report['actual'])}")
+    print(f"{'Модель':<12}{'MSE':>14}{'r²':>12}{'Попадания':>12}")
+    for m in MODELS:
+        print(f"{m:<12}{report[m]['mse']:>14.6f}{report[m]['r2']:>12.4f}{report[m]['hit_rate']:>12.2%}")
+
+if __name__ == "__main__":
+    main()
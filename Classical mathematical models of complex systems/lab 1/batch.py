@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from regression import MODELS, fit_all_models, predict
+from metrics import goodness_of_fit
+from orthogonal import OrthogonalPolynomialSweep
+from quote_cache import QuoteCache, csv_provider, yfinance_provider
+from report import TITLES, build_series, render_report
+
+def read_tickers(tickers=None, tickers_file=None):
+    result = list(tickers or [])
+    if tickers_file:
+        with open(tickers_file) as f:
+            for line in f:
+                line = line.split('#')[0].strip()
+                if line:
+                    result.extend(line.replace(',', ' ').split())
+    return list(dict.fromkeys(result))
+
+def load_close(ticker, start_date, end_date, cache_dir, offline=False, fixture=None):
+    provider = csv_provider(fixture.format(ticker=ticker)) if fixture else yfinance_provider
+    cache = QuoteCache(cache_dir, provider, offline=offline)
+    return cache.get(ticker, start_date, end_date)
+
+def forecast_index(dates, new_date):
+    last = np.datetime64(dates[-1], 'D')
+    return len(dates) + int(np.busday_count(last + 1, np.datetime64(new_date, 'D') + 1))
+
+def fit_models(x, y, degree=16):
+    if degree == "auto":
+        sweep = OrthogonalPolynomialSweep(x, y, max_degree=16)
+        coefs = fit_all_models(x, y, sweep.best_degree)
+        coefs['polynomial'] = sweep.monomial_coefficients(sweep.best_degree)
+        return sweep.best_degree, coefs, sweep
+    degree = int(degree)
+    return degree, fit_all_models(x, y, degree), None
+
+def analyze_ticker(ticker, start_date, end_date, new_date, degree=16, cache_dir="quotes_cache", offline=False, fixture=None,
+                   report_dir=None, report_format="png"):
+    try:
+        dates, close = load_close(ticker, start_date, end_date, cache_dir, offline, fixture)
+    except Exception as e:
+        return {'ticker': ticker, 'n': 0, 'error': str(e)}
+    if len(dates) < 2:
+        return {'ticker': ticker, 'n': len(dates), 'error': "Данные не загружены"}
+
+    close = np.asarray(close, dtype=float)
+    x = np.arange(1, len(close) + 1, dtype=float)
+    x_new = forecast_index(dates, new_date)
+    degree, coefs, _ = fit_models(x, close, degree)
+    fitted = np.array([predict(m, coefs[m], x) for m in MODELS])
+    scores = goodness_of_fit(fitted, close, x)
+    models = dict()
+    for i, m in enumerate(MODELS):
+        models[m] = {
+            'coefs': coefs[m],
+            'forecast': float(predict(m, coefs[m], x_new)),
+        }
+        models[m].update({k: float(scores[k][i]) for k in ('r2', 'mse', 'mae', 'correlation', 'residual_mean', 'residual_std', 'max_abs_error')})
+    result = {
+        'ticker': ticker,
+        'n': len(close),
+        'first_date': str(dates[0]),
+        'last_date': str(dates[-1]),
+        'new_date': new_date,
+        'degree': degree,
+        'correlation_xy': float(scores['correlation_xy']),
+        'models': models,
+    }
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in '-_.' else '_' for c in ticker)
+        result['report'] = os.path.join(report_dir, f'{safe}.{report_format}')
+        render_report(build_series(dates, close, coefs, new_date), degree, new_date, TITLES.get(ticker, ticker), result['report'])
+    return result
+
+def analyze_tickers(tickers, start_date, end_date, new_date, degree=16, cache_dir="quotes_cache", offline=False, fixture=None,
+                    workers=None, report_dir=None, report_format="png"):
+    workers = min(workers or os.cpu_count() or 1, len(tickers))
+    if workers <= 1:
+        return [analyze_ticker(t, start_date, end_date, new_date, degree, cache_dir, offline, fixture, report_dir, report_format) for t in tickers]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_ticker, t, start_date, end_date, new_date, degree, cache_dir, offline, fixture,
+                               report_dir, report_format) for t in tickers]
+        return [f.result() for f in futures]
+
+def format_table(results):
+    lines = [f"{'Тикер':<12}{'Модель':<12}{'N':>6}{'r²':>10}{'MSE':>14}{'MAE':>12}{'Прогноз':>14}  Коэффициенты"]
+    for row in results:
+        if 'error' in row:
+            lines.append(f"{row['ticker']:<12}{'-':<12}{row['n']:>6}  Ошибка: {row['error']}")
+            continue
+        for m in MODELS:
+            res = row['models'][m]
+            coefs = " ".join(f"{k}={v:.6g}" for k, v in res['coefs'].items())
+            lines.append(f"{row['ticker']:<12}{m:<12}{row['n']:>6}{res['r2']:>10.4f}{res['mse']:>14.6f}{res['mae']:>12.6f}{res['forecast']:>14.4f}  {coefs}")
+    return "\n".join(lines)
+
+def result_rows(results):
+    rows = list()
+    for row in results:
+        base = {k: row.get(k) for k in ('ticker', 'n', 'first_date', 'last_date', 'new_date', 'degree', 'correlation_xy')}
+        if 'error' in row:
+            rows.append(dict(base, error=row['error']))
+            continue
+        for m in MODELS:
+            res = row['models'][m]
+            rows.append(dict(base, model=m, **{k: v for k, v in res.items() if k != 'coefs'}, **res['coefs']))
+    return rows
+
+def export_results(results, fmt="table", path=None):
+    if fmt == "json":
+        text = json.dumps(results, ensure_ascii=False, indent=2)
+    elif fmt == "csv":
+        rows = result_rows(results)
+        fields = list(dict.fromkeys(k for row in rows for k in row))
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+        text = buffer.getvalue()
+    else:
+        text = format_table(results)
+
+    if path is None or path == "-":
+        sys.stdout.write(text + ("" if text.endswith("\n") else "\n"))
+    else:
+        with open(path, 'w', newline='') as f:
+            f.write(text)
@@ -0,0 +1,85 @@
+import numpy as np
+
+CHUNK = 1 << 16
+
+class StreamingMetrics():
+    def __init__(self, models=1):
+        self.n = 0
+        self.mean_y = 0.0
+        self.m2_y = 0.0
+        self.mean_x = 0.0
+        self.m2_x = 0.0
+        self.c_xy = 0.0
+        self.mean_p = np.zeros(models)
+        self.m2_p = np.zeros(models)
+        self.c_py = np.zeros(models)
+        self.mean_r = np.zeros(models)
+        self.m2_r = np.zeros(models)
+        self.sum_abs_r = np.zeros(models)
+        self.max_abs_r = np.zeros(models)
+
+    @staticmethod
+    def __merge(n_a, n_b, mean_a, mean_b, m2_a, m2_b):
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        return mean_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n, delta
+
+    def update(self, predictions, y, x=None):
+        predictions = np.atleast_2d(np.asarray(predictions, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        x = None if x is None else np.atleast_1d(np.asarray(x, dtype=float))
+        for lo in range(0, len(y), CHUNK):
+            hi = lo + CHUNK
+            self.__update_chunk(predictions[:, lo:hi], y[lo:hi], None if x is None else x[lo:hi])
+        return self
+
+    def __update_chunk(self, p, y, x):
+        n_a, n_b = self.n, len(y)
+        if n_b == 0:
+            return
+        n = n_a + n_b
+        r = y - p
+
+        mean_y = y.mean()
+        dy = y - mean_y
+        mean_p = p.mean(axis=1)
+        dp = p - mean_p[:, None]
+        mean_r = r.mean(axis=1)
+        dr = r - mean_r[:, None]
+
+        self.mean_y, self.m2_y, delta_y = self.__merge(n_a, n_b, self.mean_y, mean_y, self.m2_y, dy @ dy)
+        self.mean_p, self.m2_p, delta_p = self.__merge(n_a, n_b, self.mean_p, mean_p, self.m2_p, np.einsum('ij,ij->i', dp, dp))
+        self.c_py = self.c_py + dp @ dy + delta_p * delta_y * n_a * n_b / n
+        self.mean_r, self.m2_r, _ = self.__merge(n_a, n_b, self.mean_r, mean_r, self.m2_r, np.einsum('ij,ij->i', dr, dr))
+        self.sum_abs_r = self.sum_abs_r + np.abs(r).sum(axis=1)
+        self.max_abs_r = np.maximum(self.max_abs_r, np.abs(r).max(axis=1))
+
+        if x is not None:
+            mean_x = x.mean()
+            dx = x - mean_x
+            self.mean_x, self.m2_x, delta_x = self.__merge(n_a, n_b, self.mean_x, mean_x, self.m2_x, dx @ dx)
+            self.c_xy = self.c_xy + dx @ dy + delta_x * delta_y * n_a * n_b / n
+        self.n = n
+
+    def result(self):
+        n = self.n
+        sse = self.m2_r + n * self.mean_r ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'n': n,
+                'mse': sse / n,
+                'r2': 1 - sse / self.m2_y,
+                'mae': self.sum_abs_r / n,
+                'correlation': self.c_py / np.sqrt(self.m2_p * self.m2_y),
+                'correlation_xy': self.c_xy / np.sqrt(self.m2_x * self.m2_y),
+                'residual_mean': self.mean_r,
+                'residual_std': np.sqrt(self.m2_r / n),
+                'max_abs_error': self.max_abs_r,
+            }
+
+def goodness_of_fit(predictions, y, x=None):
+    predictions = np.asarray(predictions, dtype=float)
+    scores = StreamingMetrics(1 if predictions.ndim == 1 else len(predictions)).update(predictions, y, x).result()
+    if predictions.ndim == 1:
+        return {k: v[0] if isinstance(v, np.ndarray) else v for k, v in scores.items()}
+    return scores
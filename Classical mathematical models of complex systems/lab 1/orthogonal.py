@@ -0,0 +1,78 @@
+import numpy as np
+
+class OrthogonalPolynomialSweep():
+    def __init__(self, x, y, max_degree=16):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n = len(x)
+        self.max_degree = min(max_degree, n - 1)
+        self.x_min = float(x.min())
+        self.x_max = float(x.max()) if x.max() > x.min() else self.x_min + 1.0
+        t = self.__to_window(x)
+
+        self.alpha = np.zeros(self.max_degree + 1)
+        self.beta = np.zeros(self.max_degree + 2)
+        self.coefs = np.zeros(self.max_degree + 1)
+        self.mse = np.zeros(self.max_degree + 1)
+        self.loo = np.zeros(self.max_degree + 1)
+        self.gcv = np.zeros(self.max_degree + 1)
+
+        q_prev = np.zeros(n)
+        q = np.full(n, 1 / np.sqrt(n))
+        fit = np.zeros(n)
+        leverage = np.zeros(n)
+        for k in range(self.max_degree + 1):
+            self.coefs[k] = q @ y
+            fit += self.coefs[k] * q
+            leverage += q ** 2
+            residual = y - fit
+            self.mse[k] = np.mean(residual ** 2)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.loo[k] = np.mean((residual / (1 - leverage)) ** 2)
+                self.gcv[k] = self.mse[k] / (1 - (k + 1) / n) ** 2
+
+            v = t * q
+            self.alpha[k] = v @ q
+            v -= self.alpha[k] * q + self.beta[k] * q_prev
+            v -= (v @ q) * q
+            self.beta[k + 1] = np.sqrt(v @ v)
+            if self.beta[k + 1] == 0:
+                self.max_degree = k
+                break
+            q_prev, q = q, v / self.beta[k + 1]
+        self.n = n
+
+    def __to_window(self, x):
+        return 2 * (np.asarray(x, dtype=float) - self.x_min) / (self.x_max - self.x_min) - 1
+
+    @property
+    def best_degree(self):
+        scores = np.where(np.isfinite(self.loo[1:self.max_degree + 1]), self.loo[1:self.max_degree + 1], np.inf)
+        return int(np.argmin(scores)) + 1
+
+    def __degree(self, degree):
+        return self.best_degree if degree is None else min(degree, self.max_degree)
+
+    def predict(self, x, degree=None):
+        degree = self.__degree(degree)
+        t = self.__to_window(x)
+        p_prev = np.zeros_like(t)
+        p = np.full_like(t, 1 / np.sqrt(self.n))
+        result = self.coefs[0] * p
+        for k in range(degree):
+            p_prev, p = p, ((t - self.alpha[k]) * p - self.beta[k] * p_prev) / self.beta[k + 1]
+            result += self.coefs[k + 1] * p
+        return result
+
+    def monomial_coefficients(self, degree=None):
+        degree = self.__degree(degree)
+        P = np.polynomial.Polynomial
+        p_prev = P([0.0])
+        p = P([1 / np.sqrt(self.n)])
+        result = self.coefs[0] * p
+        for k in range(degree):
+            p_prev, p = p, (P([-self.alpha[k], 1.0]) * p - self.beta[k] * p_prev) / self.beta[k + 1]
+            result += self.coefs[k + 1] * p
+        coefs = P(result.coef, domain=[self.x_min, self.x_max]).convert().coef
+        coefs = np.pad(coefs, (0, degree + 1 - len(coefs)))
+        return {f'a_{i + 1}': float(coefs[i]) for i in range(degree + 1)}
@@ -0,0 +1,126 @@
+import csv
+import os
+import numpy as np
+
+DAY = np.timedelta64(1, 'D')
+SETTLE = 2 * DAY
+
+def _empty():
+    return np.empty(0, dtype='datetime64[D]'), np.empty(0, dtype=float)
+
+def yfinance_provider(ticker, start, end):
+    import yfinance as yf
+    yf_data = yf.download(ticker, start=str(start), end=str(end), progress=False)
+    if len(yf_data) == 0:
+        return _empty()
+    dates = yf_data.index.values.astype('datetime64[D]')
+    close = yf_data['Close'][ticker].to_numpy(dtype=float)
+    return dates, close
+
+def csv_provider(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    all_dates = np.array([row['Date'][:10] for row in rows], dtype='datetime64[D]')
+    all_close = np.array([float(row['Close']) for row in rows])
+
+    def provider(ticker, start, end):
+        mask = (all_dates >= start) & (all_dates < end)
+        return all_dates[mask], all_close[mask]
+    return provider
+
+class QuoteCache():
+    def __init__(self, cache_dir, provider=yfinance_provider, offline=False):
+        self.cache_dir = cache_dir
+        self.provider = provider
+        self.offline = offline
+
+    def __path(self, ticker, name):
+        safe = "".join(c if c.isalnum() or c in '-_.' else '_' for c in ticker)
+        return os.path.join(self.cache_dir, safe, f'{name}.npy')
+
+    def __load(self, ticker, name, dtype, shape=(0,)):
+        path = self.__path(ticker, name)
+        if not os.path.exists(path):
+            return np.empty(shape, dtype=dtype)
+        return np.load(path, mmap_mode='r')
+
+    def __save(self, ticker, name, array):
+        path = self.__path(ticker, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp.npy'
+        np.save(tmp, array)
+        os.replace(tmp, path)
+
+    def covered_ranges(self, ticker):
+        return self.__load(ticker, 'ranges', 'datetime64[D]', (0, 2))
+
+    def missing_ranges(self, ticker, start, end):
+        start = np.datetime64(start, 'D')
+        end = min(np.datetime64(end, 'D'), np.datetime64('today', 'D') + DAY)
+        missing = list()
+        cursor = start
+        for r_start, r_end in sorted(self.covered_ranges(ticker).tolist()):
+            r_start, r_end = np.datetime64(r_start, 'D'), np.datetime64(r_end, 'D')
+            if r_end <= cursor:
+                continue
+            if r_start >= end:
+                break
+            if r_start > cursor:
+                missing.append((cursor, r_start))
+            cursor = max(cursor, r_end)
+        if cursor < end:
+            missing.append((cursor, end))
+        return missing
+
+    def __merge_ranges(self, ranges):
+        merged = list()
+        for r_start, r_end in sorted(ranges):
+            if merged and r_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], r_end)
+            else:
+                merged.append([r_start, r_end])
+        return np.array(merged, dtype='datetime64[D]').reshape(-1, 2)
+
+    def __settled_end(self, start, end, dates):
+        settled = np.datetime64('today', 'D') - SETTLE + DAY
+        if end <= settled:
+            return end
+        last = dates.max() + DAY if len(dates) else start
+        return max(start, min(settled, last))
+
+    def update(self, ticker, start, end):
+        missing = self.missing_ranges(ticker, start, end)
+        if not missing:
+            return
+        dates = [np.array(self.__load(ticker, 'dates', 'datetime64[D]'))]
+        close = [np.array(self.__load(ticker, 'close', float))]
+        covered = list()
+        for m_start, m_end in missing:
+            new_dates, new_close = self.provider(ticker, m_start, m_end)
+            new_dates = np.asarray(new_dates, dtype='datetime64[D]')
+            dates.append(new_dates)
+            close.append(np.asarray(new_close, dtype=float))
+            c_end = self.__settled_end(m_start, m_end, new_dates)
+            if c_end > m_start:
+                covered.append((m_start, c_end))
+        dates = np.concatenate(dates)
+        close = np.concatenate(close)
+        order = np.argsort(dates[::-1], kind='stable')
+        dates, close = dates[::-1][order], close[::-1][order]
+        dates, first = np.unique(dates, return_index=True)
+        close = close[first]
+
+        ranges = [tuple(r) for r in self.covered_ranges(ticker).tolist()] + covered
+        self.__save(ticker, 'dates', dates)
+        self.__save(ticker, 'close', close)
+        self.__save(ticker, 'ranges', self.__merge_ranges(
+            [(np.datetime64(s, 'D'), np.datetime64(e, 'D')) for s, e in ranges]))
+
+    def get(self, ticker, start, end):
+        if not self.offline:
+            self.update(ticker, start, end)
+        dates = self.__load(ticker, 'dates', 'datetime64[D]')
+        close = self.__load(ticker, 'close', float)
+        lo = np.searchsorted(dates, np.datetime64(start, 'D'), side='left')
+        hi = np.searchsorted(dates, np.datetime64(end, 'D'), side='left')
+        return dates[lo:hi], close[lo:hi]
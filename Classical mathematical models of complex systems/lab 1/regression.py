@@ -0,0 +1,195 @@
+import numpy as np
+
+MODELS = ('linear', 'parabolic', 'exponential', 'power', 'log', 'polynomial')
+
+CHUNK = 1 << 16
+
+def default_scale(x):
+    x = np.asarray(x, dtype=float)
+    scale = float(np.max(np.abs(x))) if len(x) else 1.0
+    return scale or 1.0
+
+def empty_statistics(degree=16, scale=None):
+    max_degree = max(degree, 2)
+    return {
+        'n': 0,
+        'degree': degree,
+        'scale': scale,
+        'x_pow': np.zeros(2 * max_degree + 1),
+        'xy_pow': np.zeros(max_degree + 1),
+        'x_pow_ln_y': np.zeros(2),
+        'ln_x_pow': np.zeros(3),
+        'ln_x_pow_y': np.zeros(2),
+        'ln_x_pow_ln_y': np.zeros(2),
+    }
+
+def rescale_statistics(stats, scale):
+    ratio = stats['scale'] / scale
+    stats['x_pow'] *= ratio ** np.arange(len(stats['x_pow']))
+    stats['xy_pow'] *= ratio ** np.arange(len(stats['xy_pow']))
+    stats['x_pow_ln_y'] *= ratio ** np.arange(2)
+    stats['scale'] = scale
+    return stats
+
+def update_statistics(stats, x, y, sign=1):
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    if sign > 0 and len(x):
+        scale = default_scale(x)
+        if stats['scale'] is None:
+            stats['scale'] = scale
+        elif scale > stats['scale']:
+            rescale_statistics(stats, scale)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ln_x = np.log(x)
+        ln_y = np.log(y)
+
+    columns = len(stats['x_pow'])
+    rhs_columns = len(stats['xy_pow'])
+    x_scaled = x / (stats['scale'] or 1.0)
+    for lo in range(0, len(x), CHUNK):
+        hi = lo + CHUNK
+        p = np.vander(x_scaled[lo:hi], columns, increasing=True)
+        stats['x_pow'] += sign * p.sum(axis=0)
+        stats['xy_pow'] += sign * (y[lo:hi] @ p[:, :rhs_columns])
+        stats['x_pow_ln_y'] += sign * (ln_y[lo:hi] @ p[:, :2])
+
+    stats['n'] += sign * len(x)
+    stats['ln_x_pow'] += sign * np.array([len(x), ln_x.sum(), ln_x @ ln_x])
+    stats['ln_x_pow_y'] += sign * np.array([y.sum(), ln_x @ y])
+    stats['ln_x_pow_ln_y'] += sign * np.array([ln_y.sum(), ln_x @ ln_y])
+    return stats
+
+def sufficient_statistics(x, y, degree=16, scale=None):
+    if scale is None:
+        scale = default_scale(x)
+    return update_statistics(empty_statistics(degree, scale), x, y)
+
+def normal_equation_matrix(moments, rhs, degree):
+    idx = np.arange(degree + 1)
+    return moments[np.add.outer(idx, idx)], rhs[:degree + 1]
+
+def solve_normal_equation(moments, rhs, degree):
+    A, B = normal_equation_matrix(moments, rhs, degree)
+    if not (np.all(np.isfinite(A)) and np.all(np.isfinite(B))):
+        raise ValueError("в данных есть значения вне области определения модели")
+    return np.linalg.lstsq(A, B, rcond=None)[0]
+
+def _unscale(coefs, scale):
+    return coefs / scale ** np.arange(len(coefs))
+
+def _fit_polynomial(stats, degree, name):
+    try:
+        coefs = _unscale(solve_normal_equation(stats['x_pow'], stats['xy_pow'], degree), stats['scale'] or 1.0)
+    except Exception as e:
+        print(f"Ошибка вычисления коэффициентов {name} регрессии: {e}")
+        return {f'a_{i + 1}': 0 for i in range(degree + 1)}
+    return {f'a_{i + 1}': float(coefs[i]) for i in range(degree + 1)}
+
+def _fit_linear(stats):
+    return _fit_polynomial(stats, 1, "линейной")
+
+def _fit_parabolic(stats):
+    return _fit_polynomial(stats, 2, "параболической")
+
+def _fit_exponential(stats):
+    try:
+        A_1, A_2 = _unscale(solve_normal_equation(stats['x_pow'], stats['x_pow_ln_y'], 1), stats['scale'] or 1.0)
+    except Exception as e:
+        print(f"Ошибка вычисления коэффициентов эксп регрессии: {e}")
+        return {'a_1': 1, 'a_2': 1}
+    return {'a_1': float(np.exp(A_1)), 'a_2': float(A_2)}
+
+def _fit_power(stats):
+    try:
+        A_1, A_2 = solve_normal_equation(stats['ln_x_pow'], stats['ln_x_pow_ln_y'], 1)
+    except Exception as e:
+        print(f"Ошибка вычисления коэффициентов степ регрессии: {e}")
+        return {'a_1': 1, 'a_2': 1}
+    return {'a_1': float(np.exp(A_1)), 'a_2': float(A_2)}
+
+def _fit_log(stats):
+    try:
+        a_1, a_2 = solve_normal_equation(stats['ln_x_pow'], stats['ln_x_pow_y'], 1)
+    except Exception as e:
+        print(f"Ошибка вычисления коэффициентов лог регрессии: {e}")
+        return {'a_1': 1, 'a_2': 1}
+    return {'a_1': float(a_1), 'a_2': float(a_2)}
+
+def _fit_polynomial_full(stats):
+    return _fit_polynomial(stats, stats['degree'], "полиномиальной")
+
+_FITTERS = {
+    'linear': _fit_linear,
+    'parabolic': _fit_parabolic,
+    'exponential': _fit_exponential,
+    'power': _fit_power,
+    'log': _fit_log,
+    'polynomial': _fit_polynomial_full,
+}
+
+def coefficients_from_statistics(stats, models=MODELS):
+    return {name: _FITTERS[name](stats) for name in models}
+
+def fit_all_models(x, y, degree=16):
+    return coefficients_from_statistics(sufficient_statistics(x, y, degree))
+
+def polynomial_regression_coefficients(x, y, degree=6):
+    return _fit_polynomial_full(sufficient_statistics(x, y, degree))
+
+def linear_regression_coefficients(x, y):
+    return _fit_linear(sufficient_statistics(x, y, degree=1))
+
+def parabolic_regression_coefficients(x, y):
+    return _fit_parabolic(sufficient_statistics(x, y, degree=2))
+
+def exponential_regression_coefficients(x, y):
+    return _fit_exponential(sufficient_statistics(x, y, degree=1))
+
+def power_regression_coefficients(x, y):
+    return _fit_power(sufficient_statistics(x, y, degree=1))
+
+def log_regression_coefficients(x, y):
+    return _fit_log(sufficient_statistics(x, y, degree=1))
+
+def predict(model, coefs, x):
+    x = np.asarray(x, dtype=float)
+    a = [coefs[f'a_{i + 1}'] for i in range(len(coefs))]
+    if model in ('linear', 'parabolic', 'polynomial'):
+        return np.polyval(a[::-1], x)
+    if model == 'exponential':
+        return a[0] * np.exp(a[1] * x)
+    if model == 'power':
+        return a[0] * x ** a[1]
+    if model == 'log':
+        return a[0] + a[1] * np.log(x)
+    raise ValueError(f"Неизвестная модель: {model}")
+
+class OnlineRegression():
+    def __init__(self, degree=16, scale=None, models=MODELS):
+        self.stats = empty_statistics(degree, scale)
+        self.models = models
+        self.coefficients = dict()
+
+    @classmethod
+    def from_series(cls, x, y, degree=16, models=MODELS):
+        online = cls(degree, default_scale(x), models)
+        update_statistics(online.stats, x, y)
+        online.refit()
+        return online
+
+    @property
+    def n(self):
+        return self.stats['n']
+
+    def append(self, x, y):
+        update_statistics(self.stats, x, y)
+        return self.refit()
+
+    def remove(self, x, y):
+        update_statistics(self.stats, x, y, sign=-1)
+        return self.refit()
+
+    def refit(self):
+        self.coefficients = coefficients_from_statistics(self.stats, self.models)
+        return self.coefficients
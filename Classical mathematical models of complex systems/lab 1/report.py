@@ -0,0 +1,147 @@
+from datetime import timedelta, datetime
+import numpy as np
+from regression import predict
+from metrics import goodness_of_fit
+
+TITLES = {
+    'JPY=X': 'USD/JPY',
+}
+
+SERIES = {
+    'linear': 'Linear',
+    'parabolic': 'Parabolic',
+    'exponential': 'Exponential',
+    'power': 'Power',
+    'log': 'Log',
+    'polynomial': 'Polynomial',
+}
+
+def build_series(dates, close, coefs, new_date):
+    data = {
+        'Index': [i for i in range(1, len(dates) + 1)],
+        'Date': np.asarray(dates, dtype='datetime64[s]').tolist(),
+        'Close': np.asarray(close, dtype=float).tolist()
+    }
+
+    date_obj_2 = data['Date'][-1]
+    date_obj_1 = datetime.strptime(new_date, '%Y-%m-%d')
+    d_dates = date_obj_1 - date_obj_2
+
+    data['Date new'] = [date_obj_2 + timedelta(days=d) for d in range(d_dates.days + 1) if (date_obj_2 + timedelta(days=d)).weekday() <= 4]
+    data['Index new'] = [data['Index'][-1] + i for i in range(0, len(data['Date new']))]
+
+    for m, name in SERIES.items():
+        data[name] = predict(m, coefs[m], data['Index']).tolist()
+        data[f'{name} new'] = predict(m, coefs[m], data['Index new']).tolist()
+    return data
+
+def print_formulas(coefs, degree):
+    print("Формула линейной регрессии:")
+    print(f"y = {coefs['linear']['a_2']:.6f}*x + {coefs['linear']['a_1']:.6f}\n")
+
+    print("Формула параболической регрессии:")
+    print(f"y = {coefs['parabolic']['a_1']:.6f} + {coefs['parabolic']['a_2']:.6f}*x + {coefs['parabolic']['a_3']:.6f}*x^2\n")
+
+    print("Формула экспоненциальной регрессии:")
+    print(f"y = {coefs['exponential']['a_1']:.6f} * e^({coefs['exponential']['a_2']:.6f}*x)\n")
+
+    print("Формула степенной регрессии:")
+    print(f"y = {coefs['power']['a_1']:.6f} * x^{coefs['power']['a_2']:.6f}\n")
+
+    print("Формула полиномиальной регрессии (степень {}):".format(degree))
+    formula = "y = "
+    for i in range(0, degree + 1):
+        coef = coefs['polynomial'][f'a_{i + 1}']
+        if i == 0:
+            formula += f"{coef:.6f}"
+        else:
+            sign = " + " if coef >= 0 else " - "
+            formula += f"{sign}{abs(coef):.16f}*x"
+            if i > 1:
+                formula += f"^{i}"
+    print(formula + "\n")
+    print("Формула логарифмической регрессии:")
+    print(f"y = {coefs['log']['a_1']:.6f} + {coefs['log']['a_2']:.6f}*ln(x)\n")
+
+def render_report(data, degree, new_date, title="USD/JPY", path=None):
+    import matplotlib
+    if path is not None:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    scores = goodness_of_fit([data[name] for name in SERIES.values()], data['Close'], data['Index'])
+    r2 = dict(zip(SERIES.values(), scores['r2']))
+    mse = dict(zip(SERIES.values(), scores['mse']))
+
+    fig, axs = plt.subplots(3, 2, layout="constrained")
+    fig.suptitle(f"Курс {title} {str(data['Date'][0])[: -9]} - {str(data['Date'][-1])[: -9]}", fontsize=8)
+    axs[0, 0].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+    axs[0, 1].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+    axs[1, 0].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+    axs[1, 1].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+    axs[2, 0].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+    axs[2, 1].plot(data['Date'], data["Close"], label=title,  marker='o', linestyle='', ms = 1)
+
+    label_text = (
+        f"{title} log\n"
+        f"Коэф. детер.: r² = {r2['Log']:.4f}\n"
+        f"MSE: E = {mse['Log']:.4f}"
+    )
+    axs[0, 0].plot(data['Date'], data["Log"], label=label_text, linestyle='-', color='red')
+    axs[0, 0].plot(data['Date new'], data["Log new"], label=f'{title} log new \nПредсказание на {new_date}: {data["Log new"][-1]:.4f}', linestyle='-', color='green')
+
+    label_text = (
+        f"{title} linear\n"
+        f"Коэф. коррел.: ρ = {scores['correlation_xy']:.4f}\n"
+        f"Коэф. детер.: r² = {r2['Linear']:.4f}\n"
+        f"MSE: E = {mse['Linear']:.4f}"
+    )
+    axs[0, 1].plot(data['Date'], data["Linear"], label=label_text, linestyle='-', color='red')
+    axs[0, 1].plot(data['Date new'], data["Linear new"], label=f'{title} linear new \nПредсказание на {new_date}: {data["Linear new"][-1]:.4f}', linestyle='-', color='green')
+
+    label_text = (
+        f"{title} Parabolic\n"
+        f"Коэф. детер.: r² = {r2['Parabolic']:.4f}\n"
+        f"MSE: E = {mse['Parabolic']:.4f}"
+    )
+    axs[1, 0].plot(data['Date'], data["Parabolic"], label=label_text, linestyle='-', color='purple')
+    axs[1, 0].plot(data['Date new'], data["Parabolic new"], label=f"{title} Parabolic new \nПредсказание на {new_date}: {data["Parabolic new"][-1]:.4f}", linestyle='-', color='green')
+
+    label_text = (
+        f"{title} Exponential\n"
+        f"Коэф. детер.: r² = {r2['Exponential']:.4f}\n"
+        f"MSE: E = {mse['Exponential']:.4f}"
+    )
+    axs[1, 1].plot(data['Date'], data["Exponential"], label=label_text, linestyle='-', color='yellow')
+    axs[1, 1].plot(data['Date new'], data["Exponential new"], label=f"{title} Exponential new\nПредсказание на {new_date}: {data["Exponential new"][-1]:.4f}", linestyle='-', color='green')
+
+    label_text = (
+        f"{title} Power\n"
+        f"Коэф. детер.: r² = {r2['Power']:.4f}\n"
+        f"MSE: E = {mse['Power']:.4f}"
+    )
+    axs[2, 0].plot(data['Date'], data["Power"], label=label_text, linestyle='-', color='orange')
+    axs[2, 0].plot(data['Date new'], data["Power new"], label=f"{title} Power new\nПредсказание на {new_date}: {data["Power new"][-1]:.4f}", linestyle='-', color='green')
+
+    label_text = (
+        f"{title} Polynomial ({degree})\n"
+        f"Коэф. детер.: r² = {r2['Polynomial']:.4f}\n"
+        f"MSE: E = {mse['Polynomial']:.4f}"
+    )
+    axs[2, 1].plot(data['Date'], data["Polynomial"], label=label_text, linestyle='-', color='black')
+    axs[2, 1].plot(data['Date new'], data["Polynomial new"], label=f"{title} Polynomial ({degree}) new\nПредсказание на {new_date}: {data["Polynomial new"][-1]:.4f}", linestyle='-', color='green')
+
+    for row in axs:
+        for ax in row:
+            ax.tick_params(axis='x', rotation=90, labelsize=6)
+            ax.tick_params(axis='y', labelsize=6)
+            ax.set_xlabel("Дата", fontsize=8)
+            ax.set_ylabel("Цена (JPY за 1 USD)", fontsize=8)
+            ax.legend(fontsize=6)
+            ax.grid(True)
+
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path)
+        plt.close(fig)
@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+from regression import MODELS, predict
+from batch import load_close, fit_models
+
+def date_index(dates, targets):
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    targets = np.asarray(targets, dtype='datetime64[D]')
+    last = dates[-1]
+    future = np.busday_count(last + 1, np.maximum(targets, last) + 1)
+    return np.where(targets > last, len(dates) + future, np.searchsorted(dates, targets, side='right')).astype(float)
+
+class ForecastService():
+    def __init__(self, loader, ttl=300.0, degree=16, batch_window=0.001):
+        self.loader = loader
+        self.ttl = ttl
+        self.degree = degree
+        self.batch_window = batch_window
+        self.models = dict()
+        self.fits = dict()
+        self.queue = None
+        self.__task = None
+        self.__pending = set()
+
+    def fit(self, ticker):
+        dates, close = self.loader(ticker)
+        if len(dates) < 2:
+            raise LookupError(f"Нет данных для {ticker}")
+        degree, coefs, _ = fit_models(np.arange(1, len(close) + 1), close, self.degree)
+        return {
+            'expires': time.monotonic() + self.ttl,
+            'dates': np.array(dates, dtype='datetime64[D]'),
+            'degree': degree,
+            'coefs': coefs,
+        }
+
+    def cached(self, ticker):
+        fitted = self.models.get(ticker)
+        if fitted is None or fitted['expires'] <= time.monotonic():
+            return None
+        return fitted
+
+    async def __fit(self, ticker):
+        try:
+            fitted = await asyncio.get_running_loop().run_in_executor(None, self.fit, ticker)
+            self.models[ticker] = fitted
+            return fitted
+        finally:
+            self.fits.pop(ticker, None)
+
+    async def model(self, ticker):
+        fitted = self.cached(ticker)
+        if fitted is not None:
+            return fitted
+        task = self.fits.get(ticker)
+        if task is None:
+            task = self.fits[ticker] = asyncio.create_task(self.__fit(ticker))
+        return await asyncio.shield(task)
+
+    def invalidate(self, ticker=None):
+        if ticker is None:
+            self.models.clear()
+        else:
+            self.models.pop(ticker, None)
+
+    def start(self):
+        if self.__task is None:
+            self.queue = asyncio.Queue()
+            self.__task = asyncio.create_task(self.__batch_loop())
+
+    async def stop(self):
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+        for task in list(self.__pending) + list(self.fits.values()):
+            task.cancel()
+
+    async def forecast(self, ticker, dates, model='linear'):
+        if model not in MODELS:
+            raise ValueError(f"Неизвестная модель: {model}")
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((ticker, model, np.atleast_1d(np.asarray(dates, dtype='datetime64[D]')), future))
+        return await future
+
+    async def __batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while True:
+                await asyncio.sleep(0)
+                if self.queue.empty():
+                    break
+                while not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                if loop.time() >= deadline:
+                    break
+
+            groups = dict()
+            for item in batch:
+                groups.setdefault((item[0], item[1]), []).append(item)
+            for (ticker, model), items in groups.items():
+                fitted = self.cached(ticker)
+                if fitted is not None:
+                    self.__respond(fitted, ticker, model, items)
+                else:
+                    task = asyncio.create_task(self.__respond_later(ticker, model, items))
+                    self.__pending.add(task)
+                    task.add_done_callback(self.__pending.discard)
+
+    async def __respond_later(self, ticker, model, items):
+        try:
+            fitted = await self.model(ticker)
+        except Exception as e:
+            self.__fail(items, e)
+        else:
+            self.__respond(fitted, ticker, model, items)
+
+    def __fail(self, items, e):
+        for item in items:
+            if not item[3].done():
+                item[3].set_exception(e)
+
+    def __respond(self, fitted, ticker, model, items):
+        try:
+            targets = np.concatenate([item[2] for item in items])
+            index = date_index(fitted['dates'], targets)
+            values = predict(model, fitted['coefs'][model], index)
+        except Exception as e:
+            self.__fail(items, e)
+            return
+        offset = 0
+        for item in items:
+            size = len(item[2])
+            if not item[3].done():
+                item[3].set_result({
+                    'ticker': ticker,
+                    'model': model,
+                    'dates': [str(d) for d in item[2]],
+                    'index': index[offset:offset + size].tolist(),
+                    'forecast': values[offset:offset + size].tolist(),
+                })
+            offset += size
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            status, body = 404, {'error': "Не найдено"}
+            if len(request_line) >= 2 and request_line[0] == 'GET':
+                url = urlsplit(request_line[1])
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                if url.path == '/forecast':
+                    try:
+                        dates = query['date'].split(',')
+                        status, body = 200, await self.forecast(query['ticker'], dates, query.get('model', 'linear'))
+                    except KeyError as e:
+                        status, body = 400, {'error': f"Не указан параметр {e}"}
+                    except (ValueError, LookupError) as e:
+                        status, body = 400, {'error': str(e)}
+                elif url.path == '/invalidate':
+                    self.invalidate(query.get('ticker'))
+                    status, body = 200, {'ok': True}
+            payload = json.dumps(body, ensure_ascii=False).encode()
+            writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                         f"Content-Type: application/json; charset=utf-8\r\n"
+                         f"Content-Length: {len(payload)}\r\n"
+                         f"Connection: close\r\n\r\n".encode() + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="USD/JPY forecast service")
+    parser.add_argument("start_date", type=str, help="Начальная дата истории в формате YYYY-MM-DD")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttl", type=float, default=300.0, help="Время жизни обученной модели, с")
+    parser.add_argument("--degree", type=str, default="16",
+                        help="Степень полиномиальной регрессии или auto для выбора по кросс-валидации")
+    parser.add_argument("--cache-dir", type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "quotes_cache"),
+                        help="Каталог локального кэша котировок")
+    parser.add_argument("--offline", action="store_true", help="Работать только с данными из кэша")
+    parser.add_argument("--fixture", type=str, default=None,
+                        help="CSV-файл (Date,Close) вместо загрузки из yfinance, {ticker} заменяется на тикер")
+
+    args = parser.parse_args()
+
+    def loader(ticker):
+        end_date = str(np.datetime64('today', 'D') + 1)
+        return load_close(ticker, args.start_date, end_date, args.cache_dir, args.offline, args.fixture)
+
+    service = ForecastService(loader, args.ttl, args.degree)
+    print(f"Сервис прогнозов: http://{args.host}:{args.port}/forecast?ticker=JPY=X&date=YYYY-MM-DD&model=linear")
+    asyncio.run(service.serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
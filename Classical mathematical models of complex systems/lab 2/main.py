@@ -1,6 +1,45 @@
+import numpy as np
 from math import exp, log
 from matplotlib.pyplot import plot, show, xlabel, ylabel, legend
 
+def error_trajectory(flight_duration, GPS_period, GPS_duration, C, k, dt=1, dtype=float):
+    t_local = np.arange(GPS_period + GPS_duration + 1, dtype=float)
+    decay = exp(- k * dt) ** (t_local[GPS_period:] - GPS_period + 1)
+    drift_gain = C * dt * GPS_period * (GPS_period - 1) / 2
+    gain = np.ones_like(t_local)
+    gain[GPS_period:] = decay
+    offset = C * dt * t_local * (t_local + 1) / 2
+    offset[GPS_period:] = drift_gain * decay
+
+    errors = np.empty(flight_duration, dtype=dtype)
+    first = min(flight_duration, len(t_local))
+    errors[:first] = offset[:first]
+    rest = flight_duration - first
+    if rest <= 0:
+        return errors
+
+    cycle = len(t_local) - 1
+    full, remainder = divmod(rest, cycle)
+    q_cycle = decay[-1]
+    cycles = np.arange(1, full + 2, dtype=float)
+    if q_cycle == 1:
+        cycle_start = drift_gain * cycles
+    else:
+        cycle_start = drift_gain * q_cycle * (1 - q_cycle ** cycles) / (1 - q_cycle)
+
+    body = errors[first:first + full * cycle].reshape(full, cycle)
+    np.multiply.outer(cycle_start[:full], gain[1:], out=body)
+    body += offset[1:]
+    if remainder:
+        errors[first + full * cycle:] = cycle_start[full] * gain[1:remainder + 1] + offset[1:remainder + 1]
+    return errors
+
+def error_trajectory_without_correction(flight_duration, C, dt=1, dtype=float):
+    errors = np.arange(flight_duration, dtype=dtype)
+    errors *= errors + 1
+    errors *= C * dt / 2
+    return errors
+
 class error_simulator():
     def __init__(self, flight_duration, GPS_period, GPS_duration):
         self.flight_duration = flight_duration
@@ -9,32 +48,17 @@ class error_simulator():
         self.k = - log(1 - 0.95) / GPS_duration
         self.C = 0.001
         self.dt = 1
-        self.errors_list = list()
-        self.errors_list_wihout_correction = list()        
+        self.errors_list = np.empty(0)
+        self.errors_list_wihout_correction = np.empty(0)        
         self.calculate_with_correction()
         self.calculate_without_correction()
 
     def calculate_with_correction(self):
-        error = 0
-        self.errors_list.clear()   
-        t_local = 0
-        for t in range(self.flight_duration):
-            if t_local >= self.GPS_period:
-                error -= error * (1 - exp(- self.k * self.dt))
-                if t_local - self.GPS_period == self.GPS_duration:
-                    t_local = 0
-                t_local += 1
-            else:
-                error += self.C * t_local * self.dt
-                t_local += 1
-            self.errors_list.append(error)
+        self.errors_list = error_trajectory(self.flight_duration, self.GPS_period, self.GPS_duration,
+                                            self.C, self.k, self.dt)
 
     def calculate_without_correction(self):
-        error = 0
-        self.errors_list_wihout_correction.clear()
-        for t in range(self.flight_duration):
-            error += self.C * t * self.dt
-            self.errors_list_wihout_correction.append(error)
+        self.errors_list_wihout_correction = error_trajectory_without_correction(self.flight_duration, self.C, self.dt)
 
     def get_errors(self):
         return self.errors_list
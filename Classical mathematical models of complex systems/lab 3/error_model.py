@@ -0,0 +1,121 @@
+import numpy as np
+from math import exp, log
+
+def correction_rate(GPS_duration, level=0.95):
+    return - log(1 - level) / GPS_duration
+
+def cycle_profile(GPS_period, GPS_duration, C, k, dt=1):
+    t_local = np.arange(GPS_period + GPS_duration + 1, dtype=float)
+    decay = exp(- k * dt) ** (t_local[GPS_period:] - GPS_period + 1)
+    drift_gain = C * dt * GPS_period * (GPS_period - 1) / 2
+    gain = np.ones_like(t_local)
+    gain[GPS_period:] = decay
+    offset = C * dt * t_local * (t_local + 1) / 2
+    offset[GPS_period:] = drift_gain * decay
+    return gain, offset, drift_gain
+
+CHUNK = 1 << 16
+
+def cycle_position(t, cycle, out=(None, None)):
+    t = np.asarray(t, dtype=np.int64)
+    cycles, position = np.divmod(np.maximum(t - 1, 0), cycle, out=out[::-1])
+    position += t > 0
+    return position, cycles
+
+def geometric_start(cycles, q_cycle, drift_gain):
+    cycles = np.asarray(cycles, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(q_cycle == 1, drift_gain * cycles,
+                        drift_gain * q_cycle * (1 - q_cycle ** cycles) / (1 - q_cycle))
+
+def cycle_start(cycles, gain, drift_gain):
+    return geometric_start(cycles, gain[-1], drift_gain)
+
+def cycle_starts(count, gain, drift_gain):
+    return cycle_start(np.arange(1, count + 1), gain, drift_gain)
+
+def error_trajectory(flight_duration, GPS_period, GPS_duration, C, k, dt=1, dtype=float):
+    gain, offset, drift_gain = cycle_profile(GPS_period, GPS_duration, C, k, dt)
+
+    errors = np.empty(flight_duration, dtype=dtype)
+    first = min(flight_duration, len(gain))
+    errors[:first] = offset[:first]
+    rest = flight_duration - first
+    if rest <= 0:
+        return errors
+
+    cycle = len(gain) - 1
+    full, remainder = divmod(rest, cycle)
+    cycle_start = cycle_starts(full + 1, gain, drift_gain)
+
+    body = errors[first:first + full * cycle].reshape(full, cycle)
+    np.multiply.outer(cycle_start[:full], gain[1:], out=body)
+    body += offset[1:]
+    if remainder:
+        errors[first + full * cycle:] = cycle_start[full] * gain[1:remainder + 1] + offset[1:remainder + 1]
+    return errors
+
+def error_chunk(start, stop, gain, offset, drift_gain):
+    position, cycles = cycle_position(np.arange(start, stop, dtype=np.int64), len(gain) - 1)
+    first = cycles.min(initial=0)
+    starts = cycle_start(np.arange(first, cycles.max(initial=0) + 1), gain, drift_gain)
+    return starts[cycles - first] * gain[position] + offset[position]
+
+def closed_form_errors(t, GPS_period, GPS_duration, C, k, dt=1):
+    position, cycles = cycle_position(t, np.add(GPS_period, GPS_duration))
+    q = np.exp(- np.asarray(k) * dt)
+    drift_gain = C * dt * GPS_period * (GPS_period - 1) / 2
+    correcting = position >= GPS_period
+    decay = q ** np.where(correcting, position - GPS_period + 1, 0)
+    offset = np.where(correcting, drift_gain * decay, C * dt * position * (position + 1) / 2)
+    return geometric_start(cycles, q ** (GPS_duration + 1), drift_gain) * decay + offset
+
+def iter_errors(flight_duration, GPS_period, GPS_duration, C, k, dt=1, chunk=CHUNK):
+    gain, offset, drift_gain = cycle_profile(GPS_period, GPS_duration, C, k, dt)
+    for start in range(0, flight_duration, chunk):
+        stop = min(start + chunk, flight_duration)
+        t = np.arange(start, stop, dtype=float)
+        yield start, error_chunk(start, stop, gain, offset, drift_gain), C * dt * t * (t + 1) / 2
+
+def error_trajectory_without_correction(flight_duration, C, dt=1, dtype=float):
+    errors = np.arange(flight_duration, dtype=dtype)
+    errors *= errors + 1
+    errors *= C * dt / 2
+    return errors
+
+def trajectory_summary(flight_duration, GPS_period, GPS_duration, C, k, dt=1, threshold=np.inf):
+    gain, offset, drift_gain = cycle_profile(GPS_period, GPS_duration, C, k, dt)
+    correcting = np.arange(len(gain)) >= GPS_period
+
+    first = min(flight_duration, len(gain))
+    head = offset[:first]
+    peak = head.max(initial=0.0)
+    total = head.sum()
+    above = np.count_nonzero(head > threshold)
+    gps_ticks = np.count_nonzero(correcting[:first])
+
+    rest = flight_duration - first
+    if rest > 0:
+        cycle = len(gain) - 1
+        full, remainder = divmod(rest, cycle)
+        cycle_start = cycle_starts(full + 1, gain, drift_gain)
+        g, o = gain[1:], offset[1:]
+        if full:
+            peak = max(peak, (cycle_start[full - 1] * g + o).max())
+            total += cycle_start[:full].sum() * g.sum() + full * o.sum()
+            limits = (threshold - o) / g
+            above += int((full - np.searchsorted(np.sort(cycle_start[:full]), limits, side='right')).sum())
+            gps_ticks += full * np.count_nonzero(correcting[1:])
+        if remainder:
+            tail = cycle_start[full] * g[:remainder] + o[:remainder]
+            peak = max(peak, tail.max())
+            total += tail.sum()
+            above += np.count_nonzero(tail > threshold)
+            gps_ticks += np.count_nonzero(correcting[1:remainder + 1])
+
+    return {
+        'peak': float(peak),
+        'mean': float(total / flight_duration) if flight_duration else 0.0,
+        'time_above': int(above) * dt,
+        'gps_ticks': int(gps_ticks),
+    }
@@ -0,0 +1,137 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from math import radians
+import numpy as np
+from error_model import correction_rate, closed_form_errors
+from flight_model import ground_velocity
+
+AIRCRAFT_DTYPE = np.dtype([
+    ('air_speed', float),
+    ('wind_speed', float),
+    ('aircraft_heading', float),
+    ('wind_direction', float),
+    ('angle_of_attack', float),
+    ('GPS_period', np.int64),
+    ('GPS_duration', np.int64),
+    ('C', float),
+])
+
+SUMMARY_DTYPE = np.dtype([
+    ('x', float),
+    ('y', float),
+    ('error', float),
+    ('peak_error', float),
+    ('mean_error', float),
+    ('time_above', float),
+])
+
+def make_fleet(count, air_speed=300, wind_speed=25, aircraft_heading=radians(90), wind_direction=radians(45),
+               angle_of_attack=radians(5), GPS_period=1000, GPS_duration=10, C=0.001):
+    aircraft = np.empty(count, dtype=AIRCRAFT_DTYPE)
+    aircraft['air_speed'] = air_speed
+    aircraft['wind_speed'] = wind_speed
+    aircraft['aircraft_heading'] = aircraft_heading
+    aircraft['wind_direction'] = wind_direction
+    aircraft['angle_of_attack'] = angle_of_attack
+    aircraft['GPS_period'] = GPS_period
+    aircraft['GPS_duration'] = GPS_duration
+    aircraft['C'] = C
+    return aircraft
+
+class Fleet():
+    def __init__(self, aircraft, dt=1, threshold=np.inf):
+        self.aircraft = aircraft
+        self.dt = dt
+        self.threshold = threshold
+        self.vx, self.vy = ground_velocity(aircraft['air_speed'], aircraft['aircraft_heading'], aircraft['wind_speed'],
+                                           aircraft['wind_direction'], aircraft['angle_of_attack'])
+        self.period = aircraft['GPS_period'][:, None]
+        self.duration = aircraft['GPS_duration'][:, None]
+        self.C = aircraft['C'][:, None]
+        self.k = correction_rate(aircraft['GPS_duration'])[:, None]
+        count = len(aircraft)
+        self.tick = 0
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.error = np.zeros(count)
+        self.peak_error = np.zeros(count)
+        self.total_error = np.zeros(count)
+        self.time_above = np.zeros(count)
+
+    def errors(self, start, stop):
+        return closed_form_errors(np.arange(start, stop, dtype=np.int64)[None, :], self.period, self.duration,
+                                  self.C, self.k, self.dt)
+
+    def iter_blocks(self, ticks, block=4096):
+        end = self.tick + ticks
+        while self.tick < end:
+            start, stop = self.tick, min(self.tick + block, end)
+            t = np.arange(start, stop, dtype=float) * self.dt
+            x = self.vx[:, None] * t
+            y = self.vy[:, None] * t
+            errors = self.errors(start, stop)
+
+            self.x, self.y, self.error = x[:, -1], y[:, -1], errors[:, -1]
+            np.maximum(self.peak_error, errors.max(axis=1), out=self.peak_error)
+            self.total_error += errors.sum(axis=1)
+            self.time_above += np.count_nonzero(errors > self.threshold, axis=1) * self.dt
+            self.tick = stop
+            yield start, x, y, errors
+
+    def advance(self, ticks, block=4096):
+        for _ in self.iter_blocks(ticks, block):
+            pass
+        return self
+
+    def summary(self):
+        result = np.empty(len(self.aircraft), dtype=SUMMARY_DTYPE)
+        result['x'] = self.x
+        result['y'] = self.y
+        result['error'] = self.error
+        result['peak_error'] = self.peak_error
+        result['mean_error'] = self.total_error / max(self.tick, 1)
+        result['time_above'] = self.time_above
+        return result
+
+def _simulate_shard(aircraft, flight_duration, dt, threshold, block):
+    return Fleet(aircraft, dt, threshold).advance(flight_duration, block).summary()
+
+def simulate_fleet(aircraft, flight_duration, dt=1, threshold=np.inf, block=4096, workers=None, shard=1024):
+    shards = [aircraft[i:i + shard] for i in range(0, len(aircraft), shard)]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    if workers <= 1:
+        return np.concatenate([_simulate_shard(s, flight_duration, dt, threshold, block) for s in shards])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = pool.map(_simulate_shard, shards, [flight_duration] * len(shards), [dt] * len(shards),
+                         [threshold] * len(shards), [block] * len(shards))
+        return np.concatenate(list(parts))
+
+def main():
+    parser = argparse.ArgumentParser(description="Моделирование группы самолётов")
+    parser.add_argument("--count", type=int, default=1000, help="Число самолётов")
+    parser.add_argument("--flight-duration", type=int, default=16000)
+    parser.add_argument("--threshold", type=float, default=np.inf, help="Порог ошибки для подсчёта времени превышения")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+    parser.add_argument("--shard", type=int, default=1024, help="Число самолётов на процесс за один раз")
+
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    aircraft = make_fleet(args.count,
+                          aircraft_heading=rng.uniform(0, 2 * np.pi, args.count),
+                          wind_direction=rng.uniform(0, 2 * np.pi, args.count),
+                          wind_speed=rng.uniform(0, 40, args.count),
+                          GPS_period=rng.integers(200, 2000, args.count),
+                          GPS_duration=rng.integers(5, 30, args.count))
+    summary = simulate_fleet(aircraft, args.flight_duration, threshold=args.threshold,
+                             workers=args.workers, shard=args.shard)
+
+    print(f"Самолётов: {len(summary)}")
+    for name in ('peak_error', 'mean_error', 'time_above'):
+        values = summary[name]
+        print(f"{name:<12} мин {values.min():.4f}  медиана {np.median(values):.4f}  макс {values.max():.4f}")
+
+if __name__ == "__main__":
+    main()
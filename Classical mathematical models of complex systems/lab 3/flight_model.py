@@ -0,0 +1,52 @@
+import numpy as np
+
+CHUNK = 1 << 16
+
+def ground_velocity(air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack):
+    vx = (air_speed * np.cos(aircraft_heading) + wind_speed * np.cos(wind_direction)) * np.cos(angle_of_attack)
+    vy = (air_speed * np.sin(aircraft_heading) + wind_speed * np.sin(wind_direction)) * np.cos(angle_of_attack)
+    return vx, vy
+
+def piecewise(*segments):
+    ticks = np.array([tick for tick, _ in segments], dtype=np.int64)
+    values = np.array([value for _, value in segments], dtype=float)
+    order = np.argsort(ticks, kind='stable')
+    return {'ticks': ticks[order], 'values': values[order]}
+
+def expand(schedule, start, stop):
+    if isinstance(schedule, dict):
+        index = np.searchsorted(schedule['ticks'], np.arange(start, stop), side='right') - 1
+        return schedule['values'][np.maximum(index, 0)]
+    if np.ndim(schedule) == 0:
+        return float(schedule)
+    return np.asarray(schedule, dtype=float)[start:stop]
+
+def _velocity(start, stop, air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack):
+    return ground_velocity(*(expand(s, start, stop) for s in
+                             (air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack)))
+
+def _positions(start, stop, v, previous, origin, dt):
+    if np.ndim(v) == 0:
+        return origin + v * dt * np.arange(start, stop, dtype=float)
+    step = np.broadcast_to(v, (stop - start,)) * dt
+    if start == 0:
+        step = step.copy()
+        step[0] = 0.0
+        return origin + np.cumsum(step)
+    return previous + np.cumsum(step)
+
+def integrate_flight(flight_duration, air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack,
+                     dt=1, x0=0.0, y0=0.0):
+    vx, vy = _velocity(0, flight_duration, air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack)
+    return _positions(0, flight_duration, vx, x0, x0, dt), _positions(0, flight_duration, vy, y0, y0, dt)
+
+def iter_integrate_flight(flight_duration, air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack,
+                          dt=1, x0=0.0, y0=0.0, chunk=CHUNK):
+    x_last, y_last = x0, y0
+    for start in range(0, flight_duration, chunk):
+        stop = min(start + chunk, flight_duration)
+        vx, vy = _velocity(start, stop, air_speed, aircraft_heading, wind_speed, wind_direction, angle_of_attack)
+        x = _positions(start, stop, vx, x_last, x0, dt)
+        y = _positions(start, stop, vy, y_last, y0, dt)
+        x_last, y_last = x[-1], y[-1]
+        yield start, x, y
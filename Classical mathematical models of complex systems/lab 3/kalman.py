@@ -0,0 +1,225 @@
+import argparse
+import time
+import numpy as np
+from error_model import CHUNK
+from flight_model import ground_velocity
+from fleet import make_fleet
+from streaming import iter_simulation
+
+class KalmanFilter():
+    def __init__(self, count=1, dt=1, gps_sigma=1.0, q_pos=0.0, q_vel=0.0, q_drift=1e-12, GPS_period=None,
+                 GPS_duration=None, x0=0.0, y0=0.0, p0=0.0, v0=0.0, c0=1e-4):
+        self.count = count
+        self.dt = dt
+        self.r = gps_sigma ** 2
+        self.q_pos = q_pos
+        self.q_vel = q_vel
+        self.q_drift = q_drift
+        self.tick = 0
+
+        self.x = np.full(count, x0, dtype=float)
+        self.y = np.full(count, y0, dtype=float)
+        self.bx = np.zeros(count)
+        self.by = np.zeros(count)
+        self.cx = np.zeros(count)
+        self.cy = np.zeros(count)
+        self.pp = np.full(count, p0, dtype=float)
+        self.pb = np.zeros(count)
+        self.pc = np.zeros(count)
+        self.bb = np.full(count, v0, dtype=float)
+        self.bc = np.zeros(count)
+        self.cc = np.full(count, c0, dtype=float)
+
+        self.__s = np.empty(count)
+        self.__gain_pos = np.empty(count)
+        self.__gain_vel = np.empty(count)
+        self.__gain_drift = np.empty(count)
+        self.__work = np.empty(count)
+        self.__innovation = np.empty(count)
+
+        self.available = None
+        if GPS_period is not None:
+            self.__period = np.broadcast_to(np.asarray(GPS_period, dtype=np.int64), (count,)).copy()
+            self.__cycle = self.__period + np.broadcast_to(np.asarray(GPS_duration, dtype=np.int64), (count,))
+            self.__local = np.empty(count, dtype=np.int64)
+            self.available = np.zeros(count, dtype=bool)
+            self.__mask = np.empty(count)
+
+    def schedule(self, tick):
+        if tick == 0:
+            self.available.fill(False)
+            return self.available
+        np.remainder(tick - 1, self.__cycle, out=self.__local)
+        self.__local += 1
+        return np.greater_equal(self.__local, self.__period, out=self.available)
+
+    def __predict_axis(self, position, bias, drift, increment):
+        w, dt = self.__work, self.dt
+        np.multiply(bias, dt, out=w)
+        np.subtract(increment, w, out=w)
+        position += w
+        np.multiply(drift, dt, out=w)
+        bias += w
+
+    def predict(self, dx, dy):
+        self.__predict_axis(self.x, self.bx, self.cx, dx)
+        self.__predict_axis(self.y, self.by, self.cy, dy)
+
+        w, dt = self.__work, self.dt
+        np.multiply(self.pb, 2 * dt, out=w)
+        self.pp -= w
+        np.multiply(self.bb, dt * dt, out=w)
+        self.pp += w
+        self.pp += self.q_pos
+        np.subtract(self.pc, self.bb, out=w)
+        w *= dt
+        self.pb += w
+        np.multiply(self.bc, dt * dt, out=w)
+        self.pb -= w
+        np.multiply(self.bc, dt, out=w)
+        self.pc -= w
+        np.multiply(self.bc, 2 * dt, out=w)
+        self.bb += w
+        np.multiply(self.cc, dt * dt, out=w)
+        self.bb += w
+        self.bb += self.q_vel
+        np.multiply(self.cc, dt, out=w)
+        self.bc += w
+        self.cc += self.q_drift
+
+    def __update_axis(self, position, bias, drift, fix):
+        w, innovation = self.__work, self.__innovation
+        np.subtract(fix, position, out=innovation)
+        np.multiply(self.__gain_drift, innovation, out=w)
+        drift += w
+        np.multiply(self.__gain_vel, innovation, out=w)
+        bias += w
+        np.multiply(self.__gain_pos, innovation, out=w)
+        position += w
+
+    def update(self, gx, gy, available=None):
+        s, kp, kb, kc, w = self.__s, self.__gain_pos, self.__gain_vel, self.__gain_drift, self.__work
+        np.add(self.pp, self.r, out=s)
+        np.divide(self.pp, s, out=kp)
+        np.divide(self.pb, s, out=kb)
+        np.divide(self.pc, s, out=kc)
+        if available is not None:
+            np.copyto(self.__mask, available)
+            kp *= self.__mask
+            kb *= self.__mask
+            kc *= self.__mask
+
+        self.__update_axis(self.x, self.bx, self.cx, gx)
+        self.__update_axis(self.y, self.by, self.cy, gy)
+
+        np.multiply(kc, self.pc, out=w)
+        self.cc -= w
+        np.multiply(kb, self.pc, out=w)
+        self.bc -= w
+        np.multiply(kb, self.pb, out=w)
+        self.bb -= w
+        np.multiply(kp, self.pc, out=w)
+        self.pc -= w
+        np.multiply(kp, self.pb, out=w)
+        self.pb -= w
+        np.multiply(kp, self.pp, out=w)
+        self.pp -= w
+
+    def step(self, dx, dy, gx=None, gy=None):
+        self.predict(dx, dy)
+        if gx is not None:
+            self.update(gx, gy, None if self.available is None else self.schedule(self.tick))
+        self.tick += 1
+
+def iter_fusion(p, gps_sigma=1.0, q_pos=0.0, q_vel=0.0, q_drift=1e-12, seed=None, chunk=CHUNK):
+    rng = np.random.default_rng(seed)
+    kf = KalmanFilter(1, p.dt, gps_sigma, q_pos, q_vel, q_drift, p.GPS_period, p.GPS_duration)
+    ins_x = ins_y = 0.0
+    for part in iter_simulation(p, chunk):
+        n = len(part['t'])
+        ins_x_chunk = part['x'] + part['error_without_correction']
+        ins_y_chunk = part['y'] + part['error_without_correction']
+        dx = np.diff(ins_x_chunk, prepend=ins_x)
+        dy = np.diff(ins_y_chunk, prepend=ins_y)
+        ins_x, ins_y = ins_x_chunk[-1], ins_y_chunk[-1]
+        gps_x = part['x'] + rng.normal(0.0, gps_sigma, n)
+        gps_y = part['y'] + rng.normal(0.0, gps_sigma, n)
+
+        fused_x = np.empty(n)
+        fused_y = np.empty(n)
+        for i in range(n):
+            kf.step(dx[i], dy[i], gps_x[i], gps_y[i])
+            fused_x[i] = kf.x[0]
+            fused_y[i] = kf.y[0]
+        yield {
+            't': part['t'],
+            'x': part['x'],
+            'y': part['y'],
+            'ins_x': ins_x_chunk,
+            'ins_y': ins_y_chunk,
+            'fused_x': fused_x,
+            'fused_y': fused_y,
+        }
+
+def fleet_fusion(aircraft, flight_duration, dt=1, gps_sigma=1.0, q_pos=0.0, q_vel=0.0, q_drift=1e-12, seed=None):
+    rng = np.random.default_rng(seed)
+    count = len(aircraft)
+    C = aircraft['C']
+    kf = KalmanFilter(count, dt, gps_sigma, q_pos, q_vel, q_drift, aircraft['GPS_period'], aircraft['GPS_duration'])
+    vx, vy = ground_velocity(aircraft['air_speed'], aircraft['aircraft_heading'], aircraft['wind_speed'],
+                             aircraft['wind_direction'], aircraft['angle_of_attack'])
+
+    dx, dy = np.empty(count), np.empty(count)
+    gx, gy = np.empty(count), np.empty(count)
+    noise = np.empty((2, count))
+    squared = np.zeros(count)
+    latency = np.empty(flight_duration, dtype=np.int64)
+    for tick in range(flight_duration):
+        if tick:
+            np.multiply(C, dt * tick, out=dx)
+            dy[:] = dx
+            dx += vx * dt
+            dy += vy * dt
+        else:
+            dx.fill(0.0)
+            dy.fill(0.0)
+        rng.standard_normal(out=noise)
+        noise *= gps_sigma
+        np.add(np.multiply(vx, dt * tick, out=gx), noise[0], out=gx)
+        np.add(np.multiply(vy, dt * tick, out=gy), noise[1], out=gy)
+
+        started = time.perf_counter_ns()
+        kf.step(dx, dy, gx, gy)
+        latency[tick] = time.perf_counter_ns() - started
+
+        squared += (kf.x - vx * dt * tick) ** 2 + (kf.y - vy * dt * tick) ** 2
+    return {
+        'x': kf.x.copy(),
+        'y': kf.y.copy(),
+        'rms_error': np.sqrt(squared / max(flight_duration, 1)),
+        'latency_ns': latency,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Комплексирование ИНС/GPS фильтром Калмана")
+    parser.add_argument("--count", type=int, default=1, help="Число самолётов")
+    parser.add_argument("--flight-duration", type=int, default=16000)
+    parser.add_argument("--GPS-period", type=int, default=1000)
+    parser.add_argument("--GPS-duration", type=int, default=10)
+    parser.add_argument("--gps-sigma", type=float, default=1.0, help="СКО шума GPS")
+    parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    aircraft = make_fleet(args.count, GPS_period=args.GPS_period, GPS_duration=args.GPS_duration)
+    result = fleet_fusion(aircraft, args.flight_duration, gps_sigma=args.gps_sigma, seed=args.seed)
+
+    latency = result['latency_ns'] / 1000
+    rms = result['rms_error']
+    print(f"Самолётов: {args.count}, тактов: {args.flight_duration}")
+    print(f"СКО ошибки после комплексирования: мин {rms.min():.4f}, макс {rms.max():.4f}")
+    print(f"Время шага, мкс: медиана {np.median(latency):.2f}, 99% {np.percentile(latency, 99):.2f}, "
+          f"макс {latency.max():.2f}")
+
+if __name__ == "__main__":
+    main()
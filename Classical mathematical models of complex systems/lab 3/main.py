@@ -1,40 +1,37 @@
-from math import exp, log, cos, sin, radians
-from matplotlib.pyplot import plot, show, legend, subplots, xlabel, ylabel
+import argparse
+import numpy as np
+from math import log, radians
+from error_model import CHUNK, error_trajectory, error_trajectory_without_correction, iter_errors
+from flight_model import integrate_flight
+from streaming import iter_simulation
+from kalman import iter_fusion
+from plotting import POINTS, flight_series, plot_errors, plot_flight
+from trajectory_store import TrajectoryStore, write_simulation
 
 class error_simulator():  
-    def __init__(self, flight_duration, GPS_period, GPS_duration):
+    def __init__(self, flight_duration, GPS_period, GPS_duration, precompute=True):
         self.flight_duration    = flight_duration
         self.GPS_period         = GPS_period
         self.GPS_duration       = GPS_duration
         self.k                  = - log(1 - 0.95) / GPS_duration
         self.C                  = 0.001
         self.dt                 = 1
-        self.errors_list = list()
-        self.errors_list_without_correction = list()        
-        self.calculate_with_correction()
-        self.calculate_without_correction()
+        self.errors_list = np.empty(0)
+        self.errors_list_without_correction = np.empty(0)        
+        if precompute:
+            self.calculate_with_correction()
+            self.calculate_without_correction()
 
     def calculate_with_correction(self):
-        error = 0
-        self.errors_list.clear()   
-        t_local = 0
-        for t in range(self.flight_duration):
-            if t_local >= self.GPS_period:
-                error -= error * (1 - exp(- self.k * self.dt))
-                if t_local - self.GPS_period == self.GPS_duration:
-                    t_local = 0
-                t_local += 1
-            else:
-                error += self.C * t_local * self.dt
-                t_local += 1
-            self.errors_list.append(error)
+        self.errors_list = error_trajectory(self.flight_duration, self.GPS_period, self.GPS_duration,
+                                            self.C, self.k, self.dt)
 
     def calculate_without_correction(self):
-        error = 0
-        self.errors_list_without_correction.clear()
-        for t in range(self.flight_duration):
-            error += self.C * t * self.dt
-            self.errors_list_without_correction.append(error)
+        self.errors_list_without_correction = error_trajectory_without_correction(self.flight_duration, self.C, self.dt)
+
+    def iter_errors(self, chunk=CHUNK):
+        return iter_errors(self.flight_duration, self.GPS_period, self.GPS_duration,
+                           self.C, self.k, self.dt, chunk)
 
     def get_errors(self):
         return self.errors_list
@@ -42,17 +39,12 @@ class error_simulator():
     def get_errors_without_correction(self):
         return self.errors_list_without_correction
     
-    def show_plot(self):
-        t = [i for i in range(self.flight_duration)]
-        plot(t, self.errors_list, label="Ошибка с комплексированием")
-        plot(t, self.errors_list_without_correction, label="Ошибка без комплексирования")
-        xlabel("Время")
-        ylabel("Ошибка")
-        legend()
-        show()
+    def show_plot(self, points=POINTS, path=None):
+        plot_errors(np.arange(self.flight_duration) * self.dt, self.errors_list, self.errors_list_without_correction,
+                    points, path)
 
 class plane():
-    def __init__(self):
+    def __init__(self, streaming=False):
         self.air_speed          = 300
         self.wind_speed         = 25
         self.aircraft_heading   = radians(90)
@@ -63,62 +55,52 @@ class plane():
         self.GPS_duration       = 10
         self.es = error_simulator(self.flight_duration,
                              self.GPS_period,
-                             self.GPS_duration)
-        self.x_coords = list()
-        self.y_coords = list()
+                             self.GPS_duration,
+                             precompute=not streaming)
+        self.x_coords = np.empty(0)
+        self.y_coords = np.empty(0)
+        self.series = None
         self.dt = 1
     
     def simulate_flight(self):
-        self.x_coords.clear()
-        self.y_coords.clear()
-        self.x_coords.append(0)
-        self.y_coords.append(0)
-        for t in range(1, self.flight_duration):
-            self.x_coords.append(self.x_coords[-1] + (self.air_speed * cos(self.aircraft_heading) 
-                                            + self.wind_speed * cos(self.wind_direction)) * cos(self.angle_of_attack) * self.dt)
-            self.y_coords.append(self.y_coords[-1] + (self.air_speed * sin(self.aircraft_heading) 
-                                            + self.wind_speed * sin(self.wind_direction)) * cos(self.angle_of_attack) * self.dt)
+        self.series = None
+        self.x_coords, self.y_coords = integrate_flight(self.flight_duration, self.air_speed, self.aircraft_heading,
+                                                        self.wind_speed, self.wind_direction, self.angle_of_attack,
+                                                        self.dt)
+
+    def iter_simulation(self, chunk=CHUNK):
+        return iter_simulation(self, chunk)
 
-    def show_plots(self):
-        t = [i for i in range(self.flight_duration)]    
-        fg, axs = subplots(2, 2)
-        x_coords_with_error = [self.x_coords[i] + self.es.get_errors()[i] for i in range(self.flight_duration)]
-        x_coords_with_error_without_correction = [self.x_coords[i] + self.es.get_errors_without_correction()[i] for i in range(self.flight_duration)] 
-        y_coords_with_error = [self.y_coords[i] + self.es.get_errors()[i] for i in range(self.flight_duration)]
-        y_coords_with_error_without_correction = [self.y_coords[i] + self.es.get_errors_without_correction()[i] for i in range(self.flight_duration)] 
-        
-        axs[0, 0].plot(t, self.x_coords, color='blue', label="Координата x (широта)")
-        axs[0, 0].plot(t, x_coords_with_error, color='orange', label="Координата x (широта) с комплексированием",  linestyle='--')
-        axs[0, 0].plot(t, x_coords_with_error_without_correction, color='red', label="Координата x (широта) без комплексирования")
-        axs[0, 0].legend()
-        axs[0, 0].set_xlabel("t")
-        axs[0, 0].set_ylabel("x")
-        
-        axs[1, 0].plot(t, self.y_coords, color='blue', label="Координата y (долгота)")
-        axs[1, 0].plot(t, y_coords_with_error, color='orange', label="Координата y (долгота) с комплексированием", linestyle='--')
-        axs[1, 0].plot(t, y_coords_with_error_without_correction, color='red', label="Координата y (долгота) без комплексирования")
-        axs[1, 0].legend()
-        axs[1, 0].set_xlabel("t")
-        axs[1, 0].set_ylabel("y")
+    def iter_fusion(self, gps_sigma=1.0, seed=None, chunk=CHUNK):
+        return iter_fusion(self, gps_sigma, seed=seed, chunk=chunk)
 
-        axs[0, 1].plot(self.x_coords, self.y_coords, color='blue', label="Маршрут")
-        axs[0, 1].plot( x_coords_with_error,  y_coords_with_error, color='orange', label="Маршрут с комплексированием", linestyle='--')
-        axs[0, 1].plot(x_coords_with_error_without_correction, y_coords_with_error_without_correction, color='red', label="Маршрут без комплексирования")
-        axs[0, 1].legend()
-        axs[0, 1].set_xlabel("x")
-        axs[0, 1].set_ylabel("y")
+    def plot_series(self):
+        if self.series is None:
+            self.series = flight_series(np.arange(self.flight_duration), self.x_coords, self.y_coords,
+                                        self.es.get_errors(), self.es.get_errors_without_correction())
+        return self.series
 
-        axs[1, 1].plot(t, self.es.get_errors(), label="Ошибка с комплексированием")
-        axs[1, 1].plot(t, self.es.get_errors_without_correction(), label="Ошибка без комплексирования")
-        axs[1, 1].legend()
-        axs[1, 1].set_xlabel("t")
-        axs[1, 1].set_ylabel("error")
-        
-        show()      
+    def show_plots(self, points=POINTS, path=None):
+        plot_flight(self.plot_series(), points, path)
 
 def main():
+    parser = argparse.ArgumentParser(description="Моделирование полёта с комплексированием ИНС/GPS")
+    parser.add_argument("--points", type=int, default=POINTS, help="Число точек на графике после прореживания")
+    parser.add_argument("--output", type=str, default=None, help="Сохранить графики в файл вместо показа")
+    parser.add_argument("--save", type=str, default=None, help="Записать траекторию и ошибки в файл")
+    parser.add_argument("--replay", type=str, default=None, help="Построить графики по ранее записанному файлу")
+
+    args = parser.parse_args()
+
+    if args.replay:
+        TrajectoryStore(args.replay).show_plots(points=args.points, path=args.output)
+        return
+
     p = plane()
     p.simulate_flight()
-    p.show_plots()
+    if args.save:
+        write_simulation(p, args.save)
+    p.show_plots(args.points, args.output)
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
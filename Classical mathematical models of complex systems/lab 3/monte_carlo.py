@@ -0,0 +1,146 @@
+import argparse
+import numpy as np
+from math import exp
+from error_model import correction_rate, cycle_position
+
+def schedule(start, stop, GPS_period, GPS_duration):
+    return cycle_position(np.arange(start, stop, dtype=np.int64), GPS_period + GPS_duration)[0]
+
+def _segments(mask):
+    edges = np.flatnonzero(np.diff(mask)) + 1
+    bounds = np.concatenate(([0], edges, [len(mask)]))
+    return [(lo, hi, bool(mask[lo])) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+SEGMENT = 1024
+
+def _running_sum(first, steps):
+    return np.cumsum(np.concatenate((first[:, None], steps), axis=1), axis=1)[:, 1:]
+
+class _Draws():
+    def __init__(self, entropy, runs, walk_sigma, dropout):
+        self.entropy = entropy
+        self.runs = runs
+        self.walk_sigma = walk_sigma
+        self.dropout = dropout
+        self.__segment = None
+        self.__steps = None
+        self.__uniform = None
+
+    def __load(self, segment):
+        if segment != self.__segment:
+            rng = np.random.default_rng(np.random.SeedSequence(self.entropy, spawn_key=(segment,)))
+            self.__segment = segment
+            self.__steps = rng.normal(0.0, self.walk_sigma, (self.runs, SEGMENT)) if self.walk_sigma else None
+            self.__uniform = rng.random((self.runs, SEGMENT)) if self.dropout else None
+        return self.__steps, self.__uniform
+
+    def take(self, start, stop):
+        steps, uniform = list(), list()
+        for segment in range(start // SEGMENT, (stop - 1) // SEGMENT + 1):
+            lo = max(start, segment * SEGMENT) - segment * SEGMENT
+            hi = min(stop, (segment + 1) * SEGMENT) - segment * SEGMENT
+            s, u = self.__load(segment)
+            if s is not None:
+                steps.append(s[:, lo:hi])
+            if u is not None:
+                uniform.append(u[:, lo:hi])
+        return (np.concatenate(steps, axis=1) if steps else None,
+                np.concatenate(uniform, axis=1) if uniform else None)
+
+def monte_carlo(flight_duration, GPS_period, GPS_duration, runs=1000, C=0.001, dt=1,
+                walk_sigma=0.0, bias_sigma=0.0, dropout=0.0, percentiles=(5, 50, 95),
+                seed=None, block=4096, record_every=1):
+    root = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(root)
+    draws = _Draws(root.entropy, runs, walk_sigma, dropout)
+    q = exp(- correction_rate(GPS_duration) * dt)
+    bias = rng.normal(0.0, bias_sigma, runs) if bias_sigma else np.zeros(runs)
+    walk = np.zeros(runs)
+    error = np.zeros(runs)
+
+    recorded = np.arange(0, flight_duration, record_every)
+    bands = np.empty((len(percentiles), len(recorded)))
+    mean = np.empty(len(recorded))
+    position = 0
+
+    for start in range(0, flight_duration, block):
+        stop = min(start + block, flight_duration)
+        t_local = schedule(start, stop, GPS_period, GPS_duration)
+        drift = t_local < GPS_period
+
+        steps, uniform = draws.take(start, stop)
+        if walk_sigma:
+            walk_block = _running_sum(walk, steps)
+            walk = walk_block[:, -1].copy()
+        else:
+            walk_block = np.broadcast_to(walk[:, None], (runs, stop - start))
+        noise = (bias[:, None] + walk_block) * dt
+        dropped = uniform < dropout if dropout else None
+
+        errors = np.empty((runs, stop - start))
+        for lo, hi, is_drift in _segments(drift):
+            if is_drift:
+                step = C * t_local[lo:hi] * dt + noise[:, lo:hi]
+                errors[:, lo:hi] = _running_sum(error, step)
+                error = errors[:, hi - 1].copy()
+            else:
+                for i in range(lo, hi):
+                    if dropped is None:
+                        error = error * q
+                    else:
+                        error = np.where(dropped[:, i], error + noise[:, i], error * q)
+                    errors[:, i] = error
+
+        take = recorded[(recorded >= start) & (recorded < stop)] - start
+        if len(take):
+            bands[:, position:position + len(take)] = np.percentile(errors[:, take], percentiles, axis=0)
+            mean[position:position + len(take)] = errors[:, take].mean(axis=0)
+            position += len(take)
+
+    return {
+        'time': recorded * dt,
+        'percentiles': tuple(percentiles),
+        'bands': bands,
+        'mean': mean,
+        'final': error,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Монте-Карло моделирование ошибки навигации")
+    parser.add_argument("--flight-duration", type=int, default=16000)
+    parser.add_argument("--GPS-period", type=int, default=1000)
+    parser.add_argument("--GPS-duration", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--C", type=float, default=0.001)
+    parser.add_argument("--walk-sigma", type=float, default=0.001, help="СКО приращения случайного блуждания дрейфа")
+    parser.add_argument("--bias-sigma", type=float, default=0.01, help="СКО постоянного смещения")
+    parser.add_argument("--dropout", type=float, default=0.1, help="Вероятность пропуска GPS-коррекции на такте")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--block", type=int, default=4096, help="Число тактов в одном блоке")
+    parser.add_argument("--record-every", type=int, default=1, help="Шаг сохранения полос по времени")
+    parser.add_argument("--plot", action="store_true", help="Показать полосы перцентилей")
+
+    args = parser.parse_args()
+
+    result = monte_carlo(args.flight_duration, args.GPS_period, args.GPS_duration, args.runs, args.C,
+                         walk_sigma=args.walk_sigma, bias_sigma=args.bias_sigma, dropout=args.dropout,
+                         seed=args.seed, block=args.block, record_every=args.record_every)
+
+    final = result['final']
+    print(f"Итоговая ошибка: среднее {final.mean():.4f}, СКО {final.std():.4f}")
+    for p, v in zip((1, 5, 25, 50, 75, 95, 99), np.percentile(final, (1, 5, 25, 50, 75, 95, 99))):
+        print(f"  {p:>2}%: {v:.4f}")
+
+    if args.plot:
+        from matplotlib.pyplot import plot, fill_between, show, legend, xlabel, ylabel
+        bands = result['bands']
+        fill_between(result['time'], bands[0], bands[-1], alpha=0.3,
+                     label=f"{result['percentiles'][0]}–{result['percentiles'][-1]}%")
+        plot(result['time'], result['mean'], label="Среднее")
+        xlabel("Время")
+        ylabel("Ошибка")
+        legend()
+        show()
+
+if __name__ == "__main__":
+    main()
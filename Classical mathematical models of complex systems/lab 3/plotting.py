@@ -0,0 +1,124 @@
+import numpy as np
+
+POINTS = 2000
+
+def minmax_indices(y, buckets):
+    n = len(y)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    full = n // size
+    body = y[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    parts = [[0, n - 1], body.argmin(axis=1) + offsets, body.argmax(axis=1) + offsets]
+    if full * size < n:
+        tail = y[full * size:]
+        parts.append([full * size + tail.argmin(), full * size + tail.argmax()])
+    return np.unique(np.concatenate(parts))
+
+def lttb_indices(x, y, threshold):
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    sum_x = np.concatenate(([0.0], np.cumsum(x)))
+    sum_y = np.concatenate(([0.0], np.cumsum(y)))
+    width = np.diff(edges)
+    mean_x = (sum_x[edges[1:]] - sum_x[edges[:-1]]) / width
+    mean_y = (sum_y[edges[1:]] - sum_y[edges[:-1]]) / width
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < threshold - 2:
+            next_x, next_y = mean_x[i + 1], mean_y[i + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs((x[a] - next_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y - y[a]))
+        a = lo + area.argmax()
+        selected[i + 1] = a
+    return selected
+
+def downsample(t, y, points=POINTS):
+    index = minmax_indices(y, max(points // 2, 1))
+    return t[index], y[index]
+
+def downsample_route(x, y, points=POINTS):
+    index = lttb_indices(x, y, points)
+    return x[index], y[index]
+
+def flight_series(t, x, y, error, error_without_correction):
+    x, y = np.asarray(x), np.asarray(y)
+    error, error_without_correction = np.asarray(error), np.asarray(error_without_correction)
+    return {
+        't': np.asarray(t),
+        'x': x,
+        'y': y,
+        'error': error,
+        'error_without_correction': error_without_correction,
+        'x_with_error': x + error,
+        'x_with_error_without_correction': x + error_without_correction,
+        'y_with_error': y + error,
+        'y_with_error_without_correction': y + error_without_correction,
+    }
+
+def _pyplot(path):
+    import matplotlib
+    if path is not None:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def _finish(plt, fig, path):
+    if path is None:
+        plt.show()
+    else:
+        fig.savefig(path)
+        plt.close(fig)
+
+def plot_errors(t, errors, errors_without_correction, points=POINTS, path=None):
+    plt = _pyplot(path)
+    fig = plt.figure()
+    plt.plot(*downsample(t, errors, points), label="Ошибка с комплексированием")
+    plt.plot(*downsample(t, errors_without_correction, points), label="Ошибка без комплексирования")
+    plt.xlabel("Время")
+    plt.ylabel("Ошибка")
+    plt.legend()
+    _finish(plt, fig, path)
+
+def plot_flight(series, points=POINTS, path=None):
+    plt = _pyplot(path)
+    s = series
+    t = s['t']
+    fig, axs = plt.subplots(2, 2)
+
+    axs[0, 0].plot(*downsample(t, s['x'], points), color='blue', label="Координата x (широта)")
+    axs[0, 0].plot(*downsample(t, s['x_with_error'], points), color='orange', label="Координата x (широта) с комплексированием", linestyle='--')
+    axs[0, 0].plot(*downsample(t, s['x_with_error_without_correction'], points), color='red', label="Координата x (широта) без комплексирования")
+    axs[0, 0].legend()
+    axs[0, 0].set_xlabel("t")
+    axs[0, 0].set_ylabel("x")
+
+    axs[1, 0].plot(*downsample(t, s['y'], points), color='blue', label="Координата y (долгота)")
+    axs[1, 0].plot(*downsample(t, s['y_with_error'], points), color='orange', label="Координата y (долгота) с комплексированием", linestyle='--')
+    axs[1, 0].plot(*downsample(t, s['y_with_error_without_correction'], points), color='red', label="Координата y (долгота) без комплексирования")
+    axs[1, 0].legend()
+    axs[1, 0].set_xlabel("t")
+    axs[1, 0].set_ylabel("y")
+
+    axs[0, 1].plot(*downsample_route(s['x'], s['y'], points), color='blue', label="Маршрут")
+    axs[0, 1].plot(*downsample_route(s['x_with_error'], s['y_with_error'], points), color='orange', label="Маршрут с комплексированием", linestyle='--')
+    axs[0, 1].plot(*downsample_route(s['x_with_error_without_correction'], s['y_with_error_without_correction'], points), color='red', label="Маршрут без комплексирования")
+    axs[0, 1].legend()
+    axs[0, 1].set_xlabel("x")
+    axs[0, 1].set_ylabel("y")
+
+    axs[1, 1].plot(*downsample(t, s['error'], points), label="Ошибка с комплексированием")
+    axs[1, 1].plot(*downsample(t, s['error_without_correction'], points), label="Ошибка без комплексирования")
+    axs[1, 1].legend()
+    axs[1, 1].set_xlabel("t")
+    axs[1, 1].set_ylabel("error")
+
+    _finish(plt, fig, path)
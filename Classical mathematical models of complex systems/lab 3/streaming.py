@@ -0,0 +1,57 @@
+import numpy as np
+from error_model import CHUNK, iter_errors
+from flight_model import iter_integrate_flight
+
+def iter_simulation(p, chunk=CHUNK):
+    es = p.es
+    errors = iter_errors(es.flight_duration, es.GPS_period, es.GPS_duration, es.C, es.k, es.dt, chunk)
+    flight = iter_integrate_flight(p.flight_duration, p.air_speed, p.aircraft_heading, p.wind_speed,
+                                   p.wind_direction, p.angle_of_attack, p.dt, chunk=chunk)
+    for (start, error, error_without_correction), (_, x, y) in zip(errors, flight):
+        yield {
+            't': np.arange(start, start + len(x)),
+            'x': x,
+            'y': y,
+            'error': error,
+            'error_without_correction': error_without_correction,
+        }
+
+def decimate(chunks, step):
+    offset = 0
+    for chunk in chunks:
+        n = len(next(iter(chunk.values())))
+        first = (-offset) % step
+        yield {name: values[first::step] for name, values in chunk.items()}
+        offset += n
+
+def summarize(chunks):
+    n = 0
+    peak = peak_without_correction = -np.inf
+    total = total_without_correction = 0.0
+    last = None
+    for chunk in chunks:
+        n += len(chunk['error'])
+        peak = max(peak, chunk['error'].max())
+        peak_without_correction = max(peak_without_correction, chunk['error_without_correction'].max())
+        total += chunk['error'].sum()
+        total_without_correction += chunk['error_without_correction'].sum()
+        last = chunk
+    if last is None:
+        return {'n': 0}
+    return {
+        'n': n,
+        'peak_error': float(peak),
+        'mean_error': float(total / n),
+        'peak_error_without_correction': float(peak_without_correction),
+        'mean_error_without_correction': float(total_without_correction / n),
+        'final_x': float(last['x'][-1]),
+        'final_y': float(last['y'][-1]),
+    }
+
+def write_chunks(chunks, path, fields=('t', 'x', 'y', 'error', 'error_without_correction'), dtype=np.float64):
+    rows = 0
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            np.column_stack([chunk[name] for name in fields]).astype(dtype).tofile(f)
+            rows += len(chunk[fields[0]])
+    return rows
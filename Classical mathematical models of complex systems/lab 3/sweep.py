@@ -0,0 +1,86 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import numpy as np
+from error_model import correction_rate, trajectory_summary
+
+RESULT_DTYPE = np.dtype([
+    ('GPS_period', np.int64),
+    ('GPS_duration', np.int64),
+    ('C', float),
+    ('peak', float),
+    ('mean', float),
+    ('time_above', float),
+    ('gps_ticks', np.int64),
+])
+
+def parse_values(text, cast=float):
+    values = list()
+    for part in text.split(','):
+        if ':' in part:
+            start, stop, step = (cast(v) for v in part.split(':'))
+            values.extend(cast(v) for v in np.arange(start, stop + step / 2, step))
+        else:
+            values.append(cast(part))
+    return values
+
+def _sweep_chunk(flight_duration, combos, threshold, dt):
+    result = np.empty(len(combos), dtype=RESULT_DTYPE)
+    for i, (GPS_period, GPS_duration, C) in enumerate(combos):
+        s = trajectory_summary(flight_duration, GPS_period, GPS_duration, C,
+                               correction_rate(GPS_duration), dt, threshold)
+        result[i] = (GPS_period, GPS_duration, C, s['peak'], s['mean'], s['time_above'], s['gps_ticks'])
+    return result
+
+def sweep(flight_duration, GPS_periods, GPS_durations, Cs, threshold=np.inf, dt=1, workers=None):
+    combos = [(int(p), int(d), float(c)) for p, d, c in product(GPS_periods, GPS_durations, Cs)]
+    workers = min(workers or os.cpu_count() or 1, len(combos))
+    if workers <= 1:
+        return _sweep_chunk(flight_duration, combos, threshold, dt)
+    size = -(-len(combos) // (workers * 4))
+    chunks = [combos[i:i + size] for i in range(0, len(combos), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_sweep_chunk, [flight_duration] * len(chunks), chunks,
+                              [threshold] * len(chunks), [dt] * len(chunks)))
+    return np.concatenate(parts)
+
+def cheapest_schedule(results, budget, max_time_above=None):
+    feasible = results[results['peak'] <= budget]
+    if max_time_above is not None:
+        feasible = feasible[feasible['time_above'] <= max_time_above]
+    if len(feasible) == 0:
+        return None
+    return feasible[np.lexsort((feasible['mean'], feasible['gps_ticks']))[0]]
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебор расписаний GPS-коррекции")
+    parser.add_argument("--flight-duration", type=int, default=16000)
+    parser.add_argument("--periods", type=str, default="100:2000:100", help="GPS_period: список или start:stop:step включительно")
+    parser.add_argument("--durations", type=str, default="5:50:5", help="GPS_duration: список или start:stop:step включительно")
+    parser.add_argument("--C", type=str, default="0.001", help="Коэффициенты дрейфа C")
+    parser.add_argument("--threshold", type=float, default=np.inf, help="Порог ошибки для подсчёта времени превышения")
+    parser.add_argument("--budget", type=float, default=None, help="Допустимая пиковая ошибка")
+    parser.add_argument("--max-time-above", type=float, default=None, help="Допустимое время выше порога")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+    parser.add_argument("--output", type=str, default=None, help="Файл .npy для сохранения результатов")
+
+    args = parser.parse_args()
+
+    results = sweep(args.flight_duration, parse_values(args.periods, int), parse_values(args.durations, int),
+                    parse_values(args.C), args.threshold, workers=args.workers)
+    if args.output:
+        np.save(args.output, results)
+    print(f"Комбинаций: {len(results)}")
+
+    if args.budget is not None:
+        best = cheapest_schedule(results, args.budget, args.max_time_above)
+        if best is None:
+            print("Нет расписания, укладывающегося в бюджет ошибки")
+        else:
+            print(f"GPS_period = {best['GPS_period']}, GPS_duration = {best['GPS_duration']}, C = {best['C']}")
+            print(f"Пиковая ошибка: {best['peak']:.4f}, средняя: {best['mean']:.4f}, "
+                  f"время выше порога: {best['time_above']:.0f}, тактов GPS: {best['gps_ticks']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import json
+import numpy as np
+from error_model import CHUNK
+from plotting import POINTS, flight_series, plot_flight
+from streaming import iter_simulation
+
+MAGIC = b'MAGATRJ1'
+ALIGN = 64
+FIELDS = ('t', 'x', 'y', 'error', 'error_without_correction')
+
+SCHEDULES = ('air_speed', 'wind_speed', 'aircraft_heading', 'wind_direction', 'angle_of_attack')
+
+def schedule_to_json(schedule):
+    if isinstance(schedule, dict):
+        return {'ticks': np.asarray(schedule['ticks']).tolist(), 'values': np.asarray(schedule['values'], dtype=float).tolist()}
+    if np.ndim(schedule) == 0:
+        return float(schedule)
+    return np.asarray(schedule, dtype=float).tolist()
+
+def schedule_from_json(schedule):
+    if isinstance(schedule, dict):
+        return {'ticks': np.asarray(schedule['ticks'], dtype=np.int64), 'values': np.asarray(schedule['values'], dtype=float)}
+    if isinstance(schedule, list):
+        return np.asarray(schedule, dtype=float)
+    return schedule
+
+def simulation_parameters(p):
+    es = p.es
+    return {
+        'plane': {
+            **{name: schedule_to_json(getattr(p, name)) for name in SCHEDULES},
+            'flight_duration': int(p.flight_duration),
+            'GPS_period': int(p.GPS_period),
+            'GPS_duration': int(p.GPS_duration),
+            'dt': float(p.dt),
+        },
+        'error_simulator': {
+            'flight_duration': int(es.flight_duration),
+            'GPS_period': int(es.GPS_period),
+            'GPS_duration': int(es.GPS_duration),
+            'k': float(es.k),
+            'C': float(es.C),
+            'dt': float(es.dt),
+        },
+    }
+
+def _header(fields, rows, dtype, params):
+    text = json.dumps({
+        'fields': list(fields),
+        'rows': int(rows),
+        'dtype': np.dtype(dtype).str,
+        'params': params,
+    }, ensure_ascii=False).encode()
+    size = len(MAGIC) + 4 + len(text)
+    text += b' ' * (-size % ALIGN)
+    return MAGIC + len(text).to_bytes(4, 'little') + text
+
+class TrajectoryStore():
+    def __init__(self, path, mode='r'):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} не является файлом траектории")
+            size = int.from_bytes(f.read(4), 'little')
+            header = json.loads(f.read(size))
+        self.fields = tuple(header['fields'])
+        self.rows = header['rows']
+        self.dtype = np.dtype(header['dtype'])
+        self.params = header['params']
+        plane = self.params.get('plane', {})
+        for name in SCHEDULES:
+            if name in plane:
+                plane[name] = schedule_from_json(plane[name])
+        self.offset = len(MAGIC) + 4 + size
+        self.columns = np.memmap(path, dtype=self.dtype, mode=mode, offset=self.offset,
+                                 shape=(len(self.fields), self.rows))
+
+    @classmethod
+    def create(cls, path, rows, params, fields=FIELDS, dtype=np.float64):
+        header = _header(fields, rows, dtype, params)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.truncate(len(header) + len(fields) * rows * np.dtype(dtype).itemsize)
+        return cls(path, 'r+')
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[self.fields.index(name)]
+
+    def window(self, start=0, stop=None):
+        block = self.columns[:, start:stop]
+        return {name: block[i] for i, name in enumerate(self.fields)}
+
+    def time_window(self, start, stop):
+        dt = self.params.get('plane', {}).get('dt', 1)
+        return self.window(int(np.ceil(start / dt)), int(np.ceil(stop / dt)))
+
+    def iter_chunks(self, chunk=CHUNK, start=0, stop=None):
+        stop = self.rows if stop is None else min(stop, self.rows)
+        for lo in range(start, stop, chunk):
+            yield self.window(lo, min(lo + chunk, stop))
+
+    def flush(self):
+        self.columns.flush()
+
+    def close(self):
+        self.flush()
+        self.columns = None
+
+    def show_plots(self, start=0, stop=None, points=POINTS, path=None):
+        w = self.window(start, stop)
+        plot_flight(flight_series(w['t'], w['x'], w['y'], w['error'], w['error_without_correction']), points, path)
+
+def write_simulation(p, path, dtype=np.float64, chunk=CHUNK):
+    store = TrajectoryStore.create(path, p.flight_duration, simulation_parameters(p), FIELDS, dtype)
+    for part in iter_simulation(p, chunk):
+        lo = int(part['t'][0])
+        block = store.columns[:, lo:lo + len(part['t'])]
+        for i, name in enumerate(store.fields):
+            block[i] = part[name]
+    store.flush()
+    return store
+
+def write_columns(path, columns, params=None, dtype=np.float64):
+    fields = tuple(columns)
+    rows = len(columns[fields[0]]) if fields else 0
+    store = TrajectoryStore.create(path, rows, params or dict(), fields, dtype)
+    for i, name in enumerate(fields):
+        store.columns[i] = columns[name]
+    store.flush()
+    return store
@@ -0,0 +1,80 @@
+import numpy as np
+from tissue import Lattice, neighbour_offsets
+
+FULL_SWEEP = 0.25
+
+class ActiveTissue(Lattice):
+    def __init__(self, l, h, seed=None, full_sweep=FULL_SWEEP):
+        super().__init__(l, h, seed)
+        self.full_sweep = full_sweep
+        self.__grid = self.generate_random_pattern()
+        self.regenerate(l, h)
+
+    def regenerate(self, l, h):
+        self._l = l
+        self._h = h
+        if self.__grid.shape != (h, l):
+            self.__grid = self.generate_random_pattern()
+        self.__offsets = neighbour_offsets(l, h)
+        self.__changed = None
+        self.__pending = np.empty(0, dtype=np.int64)
+        self.flipped = np.empty(0, dtype=np.int64)
+        self.evaluated = 0
+
+    @property
+    def grid(self):
+        return self.__grid
+
+    @property
+    def pattern(self):
+        return self.__grid.copy()
+
+    @pattern.setter
+    def pattern(self, pattern):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        if pattern.shape == (self._h, self._l):
+            self.__grid[...] = pattern
+            self.__changed = None
+
+    def __candidates(self):
+        z, x = np.divmod(self.__changed, self._l)
+        around = [self.__changed]
+        for dz, dx in self.__offsets:
+            around.append((z + dz) % self._h * self._l + (x + dx) % self._l)
+        return np.unique(np.concatenate(around))
+
+    def __sweep(self):
+        grid = self.__grid
+        counts = np.zeros(grid.shape, dtype=np.uint8)
+        for dz, dx in self.__offsets:
+            counts += np.roll(grid, (-dz, -dx), axis=(0, 1))
+        alive = (counts == 3) | ((grid == 1) & (counts == 2))
+        self.evaluated = grid.size
+        return np.flatnonzero(alive != grid.view(bool))
+
+    def __partial(self, cells):
+        flat = self.__grid.reshape(-1)
+        z, x = np.divmod(cells, self._l)
+        counts = np.zeros(len(cells), dtype=np.uint8)
+        for dz, dx in self.__offsets:
+            counts += flat[(z + dz) % self._h * self._l + (x + dx) % self._l]
+        state = flat[cells]
+        alive = (counts == 3) | ((state == 1) & (counts == 2))
+        self.evaluated = len(cells)
+        return cells[alive != state.view(bool)]
+
+    def compute_next_state(self):
+        if self.__changed is None or len(self.__changed) * (len(self.__offsets) + 1) > self.full_sweep * self.__grid.size:
+            self.__pending = self.__sweep()
+        else:
+            cells = self.__candidates()
+            if len(cells) > self.full_sweep * self.__grid.size:
+                self.__pending = self.__sweep()
+            else:
+                self.__pending = self.__partial(cells)
+
+    def apply_next_state(self):
+        self.__grid.reshape(-1)[self.__pending] ^= 1
+        self.flipped = self.__pending
+        self.__changed = self.__pending
+        self.__pending = np.empty(0, dtype=np.int64)
@@ -0,0 +1,58 @@
+import numpy as np
+from tissue import Lattice, neighbour_offsets
+
+class ArrayTissue(Lattice):
+    def __init__(self, l, h, seed=None):
+        super().__init__(l, h, seed)
+        self.__grid = self.generate_random_pattern()
+        self.regenerate(l, h)
+
+    def regenerate(self, l, h):
+        self._l = l
+        self._h = h
+        if self.__grid.shape != (h, l):
+            self.__grid = self.generate_random_pattern()
+        self.__next = np.empty_like(self.__grid)
+        self.__padded = np.empty((h + 2, l + 2), dtype=np.uint8)
+        self.__counts = np.empty((h, l), dtype=np.uint8)
+        self.__mask = np.empty((h, l), dtype=bool)
+        self.__offsets = neighbour_offsets(l, h)
+
+    @property
+    def grid(self):
+        return self.__grid
+
+    @property
+    def pattern(self):
+        return self.__grid.copy()
+
+    @pattern.setter
+    def pattern(self, pattern):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        if pattern.shape == (self._h, self._l):
+            self.__grid[...] = pattern
+
+    def neighbour_counts(self):
+        h, l = self._h, self._l
+        padded = self.__padded
+        padded[1:-1, 1:-1] = self.__grid
+        padded[0, 1:-1] = self.__grid[-1]
+        padded[-1, 1:-1] = self.__grid[0]
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+
+        counts = self.__counts
+        counts.fill(0)
+        for dz, dx in self.__offsets:
+            counts += padded[1 + dz:1 + dz + h, 1 + dx:1 + dx + l]
+        return counts
+
+    def compute_next_state(self):
+        counts = self.neighbour_counts()
+        np.equal(counts, 2, out=self.__mask)
+        self.__mask &= self.__grid.view(bool)
+        np.equal(counts, 3, out=self.__next.view(bool))
+        self.__next.view(bool)[...] |= self.__mask
+
+    def apply_next_state(self):
+        self.__grid, self.__next = self.__next, self.__grid
@@ -0,0 +1,102 @@
+import numpy as np
+from tissue import Lattice
+
+WORD = 64
+BAND = 256
+
+ONE = np.uint64(1)
+TOP = np.uint64(WORD - 1)
+
+def pack(pattern, words=None):
+    pattern = np.asarray(pattern, dtype=np.uint8)
+    h, l = pattern.shape
+    words = -(-l // WORD) if words is None else words
+    padded = np.zeros((h, words * WORD), dtype=np.uint8)
+    padded[:, :l] = pattern
+    return np.packbits(padded, axis=1, bitorder='little').view('<u8').astype(np.uint64)
+
+def unpack(grid, l):
+    return np.unpackbits(grid.astype('<u8').view(np.uint8), axis=1, bitorder='little')[:, :l]
+
+class BitTissue(Lattice):
+    def __init__(self, l, h, seed=None, density=0.3):
+        super().__init__(l, h, seed)
+        self.__grid = np.zeros((0, 0), dtype=np.uint64)
+        self.regenerate(l, h, density)
+
+    def regenerate(self, l, h, density=0.3):
+        self._l = l
+        self._h = h
+        self.__words = -(-l // WORD)
+        self.__last_bit = np.uint64((l - 1) % WORD)
+        self.__tail = np.uint64((1 << ((l - 1) % WORD + 1)) - 1)
+        if self.__grid.shape != (h, self.__words):
+            self.__grid = np.empty((h, self.__words), dtype=np.uint64)
+            for r0 in range(0, h, BAND):
+                r1 = min(r0 + BAND, h)
+                self.__grid[r0:r1] = pack(self._rng.random((r1 - r0, l)) < density, self.__words)
+        self.__next = np.empty_like(self.__grid)
+
+    @property
+    def grid(self):
+        return self.__grid
+
+    @property
+    def pattern(self):
+        return unpack(self.__grid, self._l)
+
+    @pattern.setter
+    def pattern(self, pattern):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        if pattern.shape == (self._h, self._l):
+            self.__grid[...] = pack(pattern, self.__words)
+
+    def population(self):
+        return int(np.bitwise_count(self.__grid).sum())
+
+    def __west(self, rows):
+        out = rows << ONE
+        out[:, 1:] |= rows[:, :-1] >> TOP
+        out[:, 0] |= (rows[:, -1] >> self.__last_bit) & ONE
+        return out
+
+    def __east(self, rows):
+        out = rows >> ONE
+        out[:, :-1] |= rows[:, 1:] << TOP
+        out[:, -1] |= (rows[:, 0] & ONE) << self.__last_bit
+        return out
+
+    def __neighbours(self, block):
+        centre = slice(1, -1)
+        planes = list()
+        if self._h > 1:
+            planes += [block[:-2], block[2:]]
+        if self._l > 1:
+            west, east = self.__west(block), self.__east(block)
+            planes += [west[centre], east[centre]]
+            if self._h > 1:
+                planes += [west[:-2], east[:-2], west[2:], east[2:]]
+        return planes
+
+    def compute_next_state(self):
+        h = self._h
+        for r0 in range(0, h, BAND):
+            r1 = min(r0 + BAND, h)
+            block = self.__grid.take(np.arange(r0 - 1, r1 + 1) % h, axis=0)
+            alive = block[1:-1]
+            s0 = np.zeros_like(alive)
+            s1 = np.zeros_like(alive)
+            s2 = np.zeros_like(alive)
+            for n in self.__neighbours(block):
+                c0 = s0 & n
+                s0 ^= n
+                s2 |= s1 & c0
+                s1 ^= c0
+            out = self.__next[r0:r1]
+            np.bitwise_or(s0, alive, out=out)
+            out &= s1
+            out &= ~s2
+            out[:, -1] &= self.__tail
+
+    def apply_next_state(self):
+        self.__grid, self.__next = self.__next, self.__grid
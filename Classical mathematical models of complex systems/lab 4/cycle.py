@@ -0,0 +1,94 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from active_tissue import ActiveTissue
+
+GOLDEN = 0x9E3779B97F4A7C15
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+
+SOUP_DTYPE = np.dtype([
+    ('seed', np.int64),
+    ('generations', np.int64),
+    ('start', np.int64),
+    ('period', np.int64),
+    ('population', np.int64),
+])
+
+def zobrist_keys(index, seed=0):
+    z = np.atleast_1d(index).astype(np.uint64) + np.uint64(GOLDEN * (seed + 1) % (1 << 64))
+    with np.errstate(over='ignore'):
+        z = (z ^ (z >> np.uint64(30))) * MIX_1
+        z = (z ^ (z >> np.uint64(27))) * MIX_2
+    return z ^ (z >> np.uint64(31))
+
+def zobrist_hash(cells, seed=0):
+    return int(np.bitwise_xor.reduce(zobrist_keys(cells, seed), initial=np.uint64(0)))
+
+class CycleDetector():
+    def __init__(self, pattern, seed=0):
+        self.seed = seed
+        self.generation = 0
+        self.hash = zobrist_hash(np.flatnonzero(np.asarray(pattern)), seed)
+        self.seen = {self.hash: 0}
+        self.start = None
+        self.period = None
+
+    @property
+    def extinct(self):
+        return self.hash == 0
+
+    def update(self, flipped):
+        self.generation += 1
+        self.hash ^= zobrist_hash(flipped, self.seed)
+        first = self.seen.get(self.hash)
+        if first is None:
+            self.seen[self.hash] = self.generation
+        elif self.period is None:
+            self.start = first
+            self.period = self.generation - first
+        return self.period
+
+    def equivalent(self, generation):
+        if self.period is None or generation < self.start:
+            return generation
+        return self.start + (generation - self.start) % self.period
+
+def run_soup(l, h, density=0.3, max_generations=10000, seed=None, engine=ActiveTissue):
+    t = engine(l, h, seed=seed)
+    t.pattern = t.generate_random_pattern(density)
+    previous = np.asarray(t.pattern)
+    detector = CycleDetector(previous)
+    while detector.generation < max_generations:
+        t.compute_next_state()
+        t.apply_next_state()
+        flipped = getattr(t, 'flipped', None)
+        if flipped is None:
+            current = np.asarray(t.pattern)
+            flipped = np.flatnonzero(current != previous)
+            previous = current
+        if detector.update(flipped) is not None:
+            break
+    return t, detector
+
+def _soup_chunk(seeds, l, h, density, max_generations):
+    result = np.empty(len(seeds), dtype=SOUP_DTYPE)
+    for i, seed in enumerate(seeds):
+        t, detector = run_soup(l, h, density, max_generations, seed)
+        result[i] = (seed, detector.generation,
+                     -1 if detector.start is None else detector.start,
+                     -1 if detector.period is None else detector.period,
+                     np.count_nonzero(t.pattern))
+    return result
+
+def soup_statistics(count, l, h, density=0.3, max_generations=10000, seed=0, workers=None):
+    seeds = list(range(seed, seed + count))
+    workers = min(workers or os.cpu_count() or 1, len(seeds))
+    if workers <= 1:
+        return _soup_chunk(seeds, l, h, density, max_generations)
+    size = -(-len(seeds) // (workers * 4))
+    chunks = [seeds[i:i + size] for i in range(0, len(seeds), size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_soup_chunk, chunks, [l] * len(chunks), [h] * len(chunks),
+                              [density] * len(chunks), [max_generations] * len(chunks)))
+    return np.concatenate(parts)
@@ -0,0 +1,293 @@
+import numpy as np
+from tissue import Lattice
+from bit_tissue import BitTissue
+
+MAX_NODES = 1 << 22
+STEP_NODES = 1 << 16
+
+def _rule(grid):
+    h, l = grid.shape
+    counts = sum(grid[1 + dz:h - 1 + dz, 1 + dx:l - 1 + dx]
+                 for dz in (-1, 0, 1) for dx in (-1, 0, 1) if dz or dx)
+    centre = grid[1:-1, 1:-1]
+    return ((counts == 3) | ((centre == 1) & (counts == 2))).astype(np.uint8)
+
+class HashLife():
+    def __init__(self, max_nodes=MAX_NODES):
+        self.max_nodes = max_nodes
+        self.clear()
+
+    def clear(self):
+        self.children = [None, None]
+        self.level = [0, 0]
+        self.population = [0, 1]
+        self.table = dict()
+        self.results = dict()
+        self.empty_nodes = [0]
+
+    def __len__(self):
+        return len(self.level)
+
+    def join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self.table.get(key)
+        if node is None:
+            node = len(self.level)
+            self.table[key] = node
+            self.children.append(key)
+            self.level.append(self.level[nw] + 1)
+            self.population.append(self.population[nw] + self.population[ne] +
+                                   self.population[sw] + self.population[se])
+        return node
+
+    def empty(self, level):
+        while len(self.empty_nodes) <= level:
+            e = self.empty_nodes[-1]
+            self.empty_nodes.append(self.join(e, e, e, e))
+        return self.empty_nodes[level]
+
+    def centre(self, node):
+        nw, ne, sw, se = self.children[node]
+        return self.join(self.children[nw][3], self.children[ne][2], self.children[sw][1], self.children[se][0])
+
+    def from_array(self, grid):
+        ids = np.asarray(grid, dtype=np.int64)
+        while ids.shape[0] > 1:
+            quads = np.stack((ids[0::2, 0::2], ids[0::2, 1::2], ids[1::2, 0::2], ids[1::2, 1::2]), axis=-1)
+            keys, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = np.array([self.join(*map(int, key)) for key in keys], dtype=np.int64)
+            ids = nodes[inverse.reshape(-1)].reshape(quads.shape[:2])
+        return int(ids[0, 0])
+
+    def periodic_node(self, grid, level):
+        grid = np.asarray(grid, dtype=np.int64)
+        h, l = grid.shape
+        ids = grid
+        for m in range(level):
+            dz, dx = (1 << m) % h, (1 << m) % l
+            quads = np.stack((ids, np.roll(ids, -dx, axis=1), np.roll(ids, -dz, axis=0),
+                              np.roll(ids, (-dz, -dx), axis=(0, 1))), axis=-1)
+            keys, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = np.array([self.join(*map(int, key)) for key in keys], dtype=np.int64)
+            ids = nodes[inverse.reshape(-1)].reshape(h, l)
+        return int(ids[0, 0])
+
+    def to_array(self, node):
+        ids = np.array([[node]], dtype=np.int64)
+        for _ in range(self.level[node]):
+            keys, inverse = np.unique(ids, return_inverse=True)
+            quads = np.array([self.children[k] for k in keys.tolist()], dtype=np.int64)[inverse.reshape(ids.shape)]
+            size = ids.shape[0]
+            expanded = np.empty((size * 2, size * 2), dtype=np.int64)
+            expanded[0::2, 0::2] = quads[..., 0]
+            expanded[0::2, 1::2] = quads[..., 1]
+            expanded[1::2, 0::2] = quads[..., 2]
+            expanded[1::2, 1::2] = quads[..., 3]
+            ids = expanded
+        return ids.astype(np.uint8)
+
+    def __fill(self, out, node, z, x):
+        h, l = out.shape
+        if z >= h or x >= l or self.population[node] == 0:
+            return
+        size = 1 << self.level[node]
+        if z + size <= h and x + size <= l:
+            out[z:z + size, x:x + size] = self.to_array(node)
+            return
+        half = size >> 1
+        nw, ne, sw, se = self.children[node]
+        self.__fill(out, nw, z, x)
+        self.__fill(out, ne, z, x + half)
+        self.__fill(out, sw, z + half, x)
+        self.__fill(out, se, z + half, x + half)
+
+    def window(self, node, h, l):
+        out = np.zeros((h, l), dtype=np.uint8)
+        self.__fill(out, node, 0, 0)
+        return out
+
+    def __base(self, node):
+        c = self.children
+        cells = np.empty((4, 4), dtype=np.uint8)
+        for quadrant, (z, x) in zip(c[node], ((0, 0), (0, 2), (2, 0), (2, 2))):
+            cells[z:z + 2, x:x + 2] = np.reshape(c[quadrant], (2, 2))
+        r = _rule(cells)
+        return self.join(int(r[0, 0]), int(r[0, 1]), int(r[1, 0]), int(r[1, 1]))
+
+    def step(self, node, j):
+        level = self.level[node]
+        if self.population[node] == 0:
+            return self.empty(level - 1)
+        key = (node, j)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+        if level == 2:
+            result = self.__base(node)
+        else:
+            nw, ne, sw, se = self.children[node]
+            c = self.children
+            n00, n02, n20, n22 = nw, ne, sw, se
+            n01 = self.join(c[nw][1], c[ne][0], c[nw][3], c[ne][2])
+            n10 = self.join(c[nw][2], c[nw][3], c[sw][0], c[sw][1])
+            n11 = self.join(c[nw][3], c[ne][2], c[sw][1], c[se][0])
+            n12 = self.join(c[ne][2], c[ne][3], c[se][0], c[se][1])
+            n21 = self.join(c[sw][1], c[se][0], c[sw][3], c[se][2])
+            grid = (n00, n01, n02, n10, n11, n12, n20, n21, n22)
+
+            if j == level - 2:
+                r = [self.step(n, level - 3) for n in grid]
+                inner = level - 3
+            else:
+                r = [self.centre(n) for n in grid]
+                inner = j
+            result = self.join(
+                self.step(self.join(r[0], r[1], r[3], r[4]), inner),
+                self.step(self.join(r[1], r[2], r[4], r[5]), inner),
+                self.step(self.join(r[3], r[4], r[6], r[7]), inner),
+                self.step(self.join(r[4], r[5], r[7], r[8]), inner),
+            )
+        self.results[key] = result
+        return result
+
+    def collect(self, roots):
+        children = np.array([c if c is not None else (0, 0, 0, 0) for c in self.children], dtype=np.int64)
+        marked = np.zeros(len(self.level), dtype=bool)
+        marked[:2] = True
+        frontier = np.unique(np.array(list(roots) + self.empty_nodes, dtype=np.int64))
+        while len(frontier):
+            marked[frontier] = True
+            frontier = np.unique(children[frontier].reshape(-1))
+            frontier = frontier[~marked[frontier]]
+
+        kept = np.flatnonzero(marked)
+        remap = np.full(len(self.level), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        new_children = remap[children[kept]]
+        self.children = [None, None] + [tuple(map(int, c)) for c in new_children[2:]]
+        self.level = [self.level[i] for i in kept]
+        self.population = [self.population[i] for i in kept]
+        self.table = {c: i for i, c in enumerate(self.children) if c is not None}
+        self.results = dict()
+        self.empty_nodes = [int(remap[e]) for e in self.empty_nodes]
+        return [int(remap[r]) for r in roots]
+
+def _power_of_two(n):
+    return n > 1 and n & (n - 1) == 0
+
+class HashTissue(Lattice):
+    def __init__(self, l, h, seed=None, max_nodes=MAX_NODES):
+        super().__init__(l, h, seed)
+        self.__life = HashLife(max_nodes)
+        self.__root = None
+        self.__next = None
+        self.__fallback = None
+        self.__retained = 0
+        self.generation = 0
+        self.regenerate(l, h)
+
+    def regenerate(self, l, h):
+        self._l = l
+        self._h = h
+        self.__life.clear()
+        self.__size = max(l, h)
+        self.__level = self.__size.bit_length() - 1
+        self.__fallback = None if _power_of_two(l) and _power_of_two(h) else BitTissue(l, h)
+        self.pattern = self.generate_random_pattern()
+
+    @property
+    def life(self):
+        return self.__life
+
+    @property
+    def pattern(self):
+        if self.__fallback is not None:
+            return self.__fallback.pattern
+        return self.__life.to_array(self.__root)[:self._h, :self._l]
+
+    @pattern.setter
+    def pattern(self, pattern):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        if pattern.shape != (self._h, self._l):
+            return
+        if self.__fallback is not None:
+            self.__fallback.pattern = pattern
+        else:
+            tiled = np.tile(pattern, (self.__size // self._h, self.__size // self._l))
+            self.__root = self.__life.from_array(tiled)
+        self.__next = None
+
+    def __tiling(self, level):
+        node = self.__root
+        for _ in range(self.__level, level):
+            node = self.__life.join(node, node, node, node)
+        return node
+
+    def __jumped(self, j):
+        life = self.__life
+        node = life.step(self.__tiling(max(self.__level + 2, j + 2)), j)
+        while life.level[node] > self.__level:
+            node = life.children[node][0]
+        return node
+
+    def __collect(self, limit):
+        if len(self.__life) > limit:
+            if self.__fallback is not None:
+                self.__life.collect([])
+            else:
+                roots = [self.__root] if self.__next is None else [self.__root, self.__next]
+                roots = self.__life.collect(roots)
+                self.__root = roots[0]
+                self.__next = roots[1] if len(roots) > 1 else None
+            self.__retained = len(self.__life)
+
+    def __settle(self, generations):
+        for _ in range(generations):
+            before = self.__fallback.pattern
+            self.__fallback.compute_next_state()
+            self.__fallback.apply_next_state()
+            if np.array_equal(before, self.__fallback.pattern):
+                break
+
+    def __embedded_jump(self, k):
+        h, l = self._h, self._l
+        if h == 1 or l == 1:
+            self.__settle(1 << k)
+            return
+        level = max(k + 2, (max(h, l) - 1).bit_length() + 1)
+        life = self.__life
+        node = life.step(life.periodic_node(self.__fallback.pattern, level), k)
+        shift = 1 << (level - 2)
+        self.__fallback.pattern = np.roll(life.window(node, h, l), (shift % h, shift % l), axis=(0, 1))
+
+    def jump(self, k):
+        if self.__fallback is not None:
+            self.__embedded_jump(k)
+        else:
+            self.__root = self.__jumped(k)
+            self.__next = None
+        self.__collect(self.__life.max_nodes)
+        self.generation += 1 << k
+
+    def advance(self, generations):
+        k = 0
+        while generations:
+            if generations & 1:
+                self.jump(k)
+            generations >>= 1
+            k += 1
+
+    def compute_next_state(self):
+        if self.__fallback is not None:
+            self.__fallback.compute_next_state()
+        else:
+            self.__next = self.__jumped(0)
+
+    def apply_next_state(self):
+        if self.__fallback is not None:
+            self.__fallback.apply_next_state()
+        else:
+            self.__root = self.__next
+            self.__next = None
+            self.__collect(min(self.__life.max_nodes, max(2 * self.__retained, STEP_NODES)))
+        self.generation += 1
@@ -0,0 +1,84 @@
+import zlib
+import numpy as np
+
+KEYFRAME = 256
+
+class History():
+    def __init__(self, pattern, keyframe=KEYFRAME, compress=False):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        self.keyframe = keyframe
+        self.compress = compress
+        self.shape = pattern.shape
+        self.__index_dtype = np.uint32 if pattern.size < 1 << 32 else np.uint64
+        self.__keyframes = list()
+        self.__deltas = list()
+        self.__last = pattern.copy()
+        self.__cursor = pattern.copy()
+        self.__tick = 0
+        self.flipped = np.empty(0, dtype=self.__index_dtype)
+        self.__store(pattern, None)
+
+    def __len__(self):
+        return len(self.__deltas)
+
+    def __pack(self, data):
+        return zlib.compress(data.tobytes(), 1) if self.compress else data
+
+    def __unpack(self, data, dtype):
+        return np.frombuffer(zlib.decompress(data), dtype=dtype) if self.compress else data
+
+    def __store(self, pattern, flipped):
+        if len(self.__deltas) % self.keyframe == 0:
+            self.__keyframes.append(self.__pack(np.packbits(pattern.reshape(-1))))
+        if flipped is None:
+            flipped = np.empty(0, dtype=self.__index_dtype)
+        self.__deltas.append(self.__pack(np.diff(flipped.astype(self.__index_dtype), prepend=self.__index_dtype(0))))
+
+    def __delta(self, tick):
+        return np.cumsum(self.__unpack(self.__deltas[tick], self.__index_dtype), dtype=self.__index_dtype)
+
+    def __load_keyframe(self, tick):
+        bits = np.unpackbits(self.__unpack(self.__keyframes[tick // self.keyframe], np.uint8))
+        self.__cursor = bits[:np.prod(self.shape)].reshape(self.shape)
+        self.__tick = tick
+
+    def append(self, pattern=None, flipped=None):
+        if flipped is None:
+            pattern = np.asarray(pattern, dtype=np.uint8)
+            flipped = np.flatnonzero(pattern.reshape(-1) != self.__last.reshape(-1))
+        else:
+            flipped = np.asarray(flipped)
+        self.__last.reshape(-1)[flipped] ^= 1
+        self.flipped = flipped
+        self.__store(self.__last, flipped)
+
+    def record(self, tissue):
+        flipped = getattr(tissue, 'flipped', None)
+        if flipped is None:
+            self.append(tissue.pattern)
+        else:
+            self.append(flipped=flipped)
+
+    def seek(self, tick):
+        if tick < 0:
+            tick += len(self)
+        if not 0 <= tick < len(self):
+            raise IndexError(f"Нет состояния для такта {tick}")
+        key = tick - tick % self.keyframe
+        if abs(tick - self.__tick) > tick - key:
+            self.__load_keyframe(key)
+        flat = self.__cursor.reshape(-1)
+        while self.__tick < tick:
+            self.__tick += 1
+            flat[self.__delta(self.__tick)] ^= 1
+        while self.__tick > tick:
+            flat[self.__delta(self.__tick)] ^= 1
+            self.__tick -= 1
+        return self.__cursor
+
+    def __getitem__(self, tick):
+        return self.seek(tick).copy()
+
+    def nbytes(self):
+        size = lambda data: len(data) if isinstance(data, bytes) else data.nbytes
+        return sum(map(size, self.__keyframes)) + sum(map(size, self.__deltas))
@@ -1,4 +1,13 @@
+import argparse
+import numpy as np
 from tissue import Tissue
+from array_tissue import ArrayTissue
+from bit_tissue import BitTissue
+from hashlife import HashTissue
+from active_tissue import ActiveTissue
+from tiled_tissue import TiledTissue
+from history import History, KEYFRAME
+from cycle import CycleDetector, soup_statistics
 from matplotlib.pyplot import subplots, show
 from matplotlib.colors import ListedColormap
 from matplotlib.widgets import Button
@@ -31,11 +40,14 @@ class PrevEvent(SimEvent):
 
 class EventB(SimEvent):
     def execute(self):
-        for z in range(self._obj.h):
-            for x in range(self._obj.l):
-                self._smltr.events_queue.put(
-                    EventA(self._smltr, self._obj.tissue[z][x])
-                )
+        if hasattr(self._obj, 'tissue'):
+            for z in range(self._obj.h):
+                for x in range(self._obj.l):
+                    self._smltr.events_queue.put(
+                        EventA(self._smltr, self._obj.tissue[z][x])
+                    )
+        else:
+            self._obj.compute_next_state()
         self._smltr.events_queue.put(EventC(self._smltr, self._obj))
 
 class EventA(SimEvent):
@@ -48,8 +60,11 @@ class EventA(SimEvent):
 class EventC(SimEvent):
     def execute(self):
         self._obj.apply_next_state()
-        self._smltr.memory.append(self._obj.pattern)
+        self._smltr.memory.record(self._obj)
         self._smltr.tick += 1
+        detector = self._smltr.detector
+        if detector.update(self._smltr.memory.flipped) is not None and detector.generation == detector.start + detector.period:
+            self._smltr.play = False
         if self._smltr.play:
             self._smltr.events_queue.put(EventB(self._smltr, self._obj))
             time.sleep(0.03)
@@ -65,11 +80,12 @@ class ChangeShowingAEvent(SimEvent):
         self._smltr.show_event_A = not self._smltr.show_event_A
 
 class Simulator():
-    def __init__(self, tissue: Tissue):
+    def __init__(self, tissue: Tissue, keyframe=KEYFRAME, compress=False):
         self.tissue = tissue
         self.events_queue = Queue()
         self.tick = 0
-        self.memory = [tissue.pattern]
+        self.memory = History(tissue.pattern, keyframe, compress)
+        self.detector = CycleDetector(tissue.pattern)
         self.play = False
         self.__img = None
         self.show_event_A = False
@@ -132,7 +148,10 @@ class Simulator():
         if 0 <= self.tick < len(self.memory):
             self.__img.set_data(p)
 
-        self.__ax.set_title(f'Tick: {self.tick}')
+        title = f'Tick: {self.tick}'
+        if self.detector.period is not None:
+            title += f', period: {self.detector.period} (since {self.detector.start})'
+        self.__ax.set_title(title)
         self.__img.figure.canvas.draw_idle()
 
     def __next(self, event):
@@ -147,8 +166,17 @@ class Simulator():
     def __change_A(self, event):
         self.events_queue.put(ChangeShowingAEvent(self)) 
         
-def simulation():
-    t = Tissue(10, 10)
+ENGINES = {
+    'cells': Tissue,
+    'array': ArrayTissue,
+    'bits': BitTissue,
+    'hashlife': HashTissue,
+    'active': ActiveTissue,
+    'tiled': TiledTissue,
+}
+
+def simulation(l=10, h=10, engine='cells', keyframe=KEYFRAME, compress=False):
+    t = ENGINES[engine](l, h)
     '''t.pattern = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
                  [0, 0, 0, 0, 0, 0, 1, 1, 1, 0],
                  [0, 0, 0, 0, 0, 1, 1, 1, 1, 1],
@@ -159,10 +187,35 @@ def simulation():
                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],]'''
-    s = Simulator(t)
+    s = Simulator(t, keyframe, compress)
     s.start_simulation()
 
 def main():
-    simulation()
-
-main()
+    parser = argparse.ArgumentParser(description="Игра «Жизнь»")
+    parser.add_argument("--width", type=int, default=10, help="Ширина поля")
+    parser.add_argument("--height", type=int, default=10, help="Высота поля")
+    parser.add_argument("--engine", type=str, default='cells', choices=list(ENGINES), help="Способ хранения и расчёта поля")
+    parser.add_argument("--keyframe", type=int, default=KEYFRAME, help="Период полных снимков в истории, тактов")
+    parser.add_argument("--compress", action="store_true", help="Сжимать историю")
+    parser.add_argument("--soups", type=int, default=0, help="Прогнать столько случайных полей без графики и собрать статистику")
+    parser.add_argument("--density", type=float, default=0.3, help="Плотность живых клеток в случайном поле")
+    parser.add_argument("--max-generations", type=int, default=10000, help="Предел поколений для одного поля")
+    parser.add_argument("--workers", type=int, default=None, help="Число процессов")
+
+    args = parser.parse_args()
+
+    if args.soups:
+        results = soup_statistics(args.soups, args.width, args.height, args.density, args.max_generations,
+                                  workers=args.workers)
+        settled = results[results['period'] > 0]
+        print(f"Полей: {len(results)}, зациклились: {len(settled)}, вымерли: {int(np.count_nonzero(settled['population'] == 0))}")
+        for period, count in zip(*np.unique(settled['period'], return_counts=True)):
+            print(f"  период {period}: {count}")
+        if len(settled):
+            print(f"Поколений до цикла: медиана {np.median(settled['start']):.0f}, макс {settled['start'].max()}")
+        return
+
+    simulation(args.width, args.height, args.engine, args.keyframe, args.compress)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from tissue import Lattice, neighbour_offsets
+
+_shared = dict()
+
+def _attach(names, shape):
+    for name in names:
+        if name not in _shared:
+            _shared[name] = (SharedMemory(name=name), shape)
+
+def _view(name):
+    shm, shape = _shared[name]
+    return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+
+def _step_tile(task):
+    src, dst, z0, z1, x0, x1 = task
+    grid, out = _view(src), _view(dst)
+    h, l = grid.shape
+    padded = grid[np.ix_(np.arange(z0 - 1, z1 + 1) % h, np.arange(x0 - 1, x1 + 1) % l)]
+    counts = np.zeros((z1 - z0, x1 - x0), dtype=np.uint8)
+    for dz, dx in neighbour_offsets(l, h):
+        counts += padded[1 + dz:1 + dz + z1 - z0, 1 + dx:1 + dx + x1 - x0]
+    centre = padded[1:-1, 1:-1]
+    out[z0:z1, x0:x1] = (counts == 3) | ((centre == 1) & (counts == 2))
+
+def _ready(_):
+    return os.getpid()
+
+def _release(pool, memory):
+    if pool is not None:
+        pool.shutdown()
+    for shm in memory:
+        _shared.pop(shm.name, None)
+        shm.unlink()
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+def _bounds(size, parts):
+    edges = np.linspace(0, size, min(parts, size) + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+class TiledTissue(Lattice):
+    def __init__(self, l, h, workers=None, tiles=None, seed=None):
+        super().__init__(l, h, seed)
+        self.workers = workers or os.cpu_count() or 1
+        self.tiles = tiles
+        self.__memory = list()
+        self.__pool = None
+        self.__finalizer = None
+        self.regenerate(l, h)
+
+    def regenerate(self, l, h):
+        self.close()
+        self._l = l
+        self._h = h
+        self.__memory = [SharedMemory(create=True, size=max(l * h, 1)) for _ in range(2)]
+        names = [shm.name for shm in self.__memory]
+        self.__current, self.__next = names
+        for shm in self.__memory:
+            _shared[shm.name] = (shm, (h, l))
+
+        rows, cols = self.tiles or (self.workers * 2, 1)
+        self.__tasks = [(z0, z1, x0, x1) for z0, z1 in _bounds(h, rows) for x0, x1 in _bounds(l, cols)]
+        if self.workers > 1:
+            self.__pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach, initargs=(names, (h, l)))
+            list(self.__pool.map(_ready, range(self.workers)))
+        self.__finalizer = weakref.finalize(self, _release, self.__pool, self.__memory)
+        self.grid[...] = self.generate_random_pattern()
+
+    def close(self):
+        if self.__finalizer is not None:
+            self.__finalizer()
+            self.__finalizer = None
+            self.__pool = None
+            self.__memory = list()
+
+    @property
+    def grid(self):
+        return _view(self.__current)
+
+    @property
+    def pattern(self):
+        return self.grid.copy()
+
+    @pattern.setter
+    def pattern(self, pattern):
+        pattern = np.asarray(pattern, dtype=np.uint8)
+        if pattern.shape == (self._h, self._l):
+            self.grid[...] = pattern
+
+    def compute_next_state(self):
+        tasks = [(self.__current, self.__next) + task for task in self.__tasks]
+        if self.__pool is None:
+            for task in tasks:
+                _step_tile(task)
+        else:
+            list(self.__pool.map(_step_tile, tasks))
+
+    def apply_next_state(self):
+        self.__current, self.__next = self.__next, self.__current
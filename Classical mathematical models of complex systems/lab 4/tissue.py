@@ -1,11 +1,44 @@
 from random import random
 from enum import Enum
 from copy import deepcopy
+import numpy as np
 
 class State(Enum):
     DEAD  = 0
     ALIVE = 1
 
+def neighbour_offsets(l, h):
+    return [(dz, dx)
+            for dz in ((0,) if h == 1 else (-1, 0, 1))
+            for dx in ((0,) if l == 1 else (-1, 0, 1))
+            if dz or dx]
+
+class Lattice():
+    def __init__(self, l, h, seed=None):
+        self._rng = np.random.default_rng(seed)
+        self._l = l
+        self._h = h
+
+    @property
+    def l(self):
+        return self._l
+
+    @l.setter
+    def l(self, value):
+        self._l = value
+
+    @property
+    def h(self):
+        return self._h
+
+    @h.setter
+    def h(self, value):
+        self._h = value
+
+    def generate_random_pattern(self, density=0.3):
+        alive = self._rng.random((self._h, self._l)) < density
+        return np.where(alive, State.ALIVE.value, State.DEAD.value).astype(np.uint8)
+
 class Cell():
     def __init__(self, state = State.DEAD, coords = (0, 0)):
         self.__state = state
@@ -103,16 +136,10 @@ class Tissue():
         
     def __add_neighbours(self, solo_cell):
         x, z = solo_cell.coords
-        dz_range = (0,) if self.__h == 1 else (-1, 0, 1)
-        dx_range = (0,) if self.__l == 1 else (-1, 0, 1)
-
-        for dz in dz_range:
-                for dx in dx_range:
-                    if dx == 0 and dz == 0:
-                        continue
-                    nx = (x + dx) % self.__l
-                    nz = (z + dz) % self.__h
-                    solo_cell.neighbours.append(self.__tissue[nz][nx])
+        for dz, dx in neighbour_offsets(self.__l, self.__h):
+            nx = (x + dx) % self.__l
+            nz = (z + dz) % self.__h
+            solo_cell.neighbours.append(self.__tissue[nz][nx])
     @property
     def pattern(self):
         return deepcopy(self.__pattern)